@@ -0,0 +1,106 @@
+"""Benchmark of loading compressed wordlists
+
+For every compression (gzip, bz2, xz) compares decompression
+to disk followed by LoadRockYou with LoadRockYou reading
+compressed file directly.
+
+Usage (from root of repository):
+    python -m benchmarks.decompressBenchmark --lines 2000000
+"""
+from benchmarks.loaderBenchmark import generateFile
+from contextlib import redirect_stdout
+
+import scripts.dataLoader as dataLoader
+import argparse
+import tempfile
+import shutil
+import lzma
+import gzip
+import time
+import bz2
+import os
+
+
+COMPRESSION_LIST = [('gz', gzip), ('bz2', bz2), ('xz', lzma)]
+
+
+def loadPasswords(file_path, users_used):
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        return dataLoader.LoadRockYou(
+            file_path,
+            users_used=users_used
+            ).load()
+
+
+def decompressAndLoad(file_path, module, users_used):
+    """Old workflow, decompress file to disk and load it
+    """
+    plain_path = file_path + '.plain'
+    with module.open(file_path, 'rb') as input_file, \
+            open(plain_path, 'wb') as output_file:
+        shutil.copyfileobj(input_file, output_file, 1 << 20)
+
+    try:
+        return loadPasswords(plain_path, users_used)
+    finally:
+        os.remove(plain_path)
+        if (os.path.exists(plain_path + '.idx')):
+            os.remove(plain_path + '.idx')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark loading of compressed wordlists'
+        )
+    parser.add_argument('--lines', type=int, default=2000000)
+    parser.add_argument('--users-used', type=int, default=1)
+    args = parser.parse_args()
+
+    file_path = os.path.join(
+        tempfile.gettempdir(),
+        'pcl_wordlist_' + str(args.lines) + '.txt'
+        )
+    if (not os.path.exists(file_path)):
+        print("Generating " + file_path)
+        generateFile(file_path, args.lines)
+
+    size = os.path.getsize(file_path)
+
+    start = time.perf_counter()
+    reference = loadPasswords(file_path, args.users_used)
+    seconds = time.perf_counter() - start
+    print('{0:5} {1:12} {2:8.2f} s {3:8.1f} MB/s'.format(
+        'plain', 'load', seconds, size / seconds / 1000000
+        ))
+
+    for extension, module in COMPRESSION_LIST:
+        compressed_path = file_path + '.' + extension
+        if (not os.path.exists(compressed_path)):
+            print("Compressing " + compressed_path)
+            with open(file_path, 'rb') as input_file, \
+                    module.open(compressed_path, 'wb') as output_file:
+                shutil.copyfileobj(input_file, output_file, 1 << 20)
+
+        for name, function in (
+            ('decompress', lambda: decompressAndLoad(
+                compressed_path, module, args.users_used
+                )),
+            ('stream', lambda: loadPasswords(
+                compressed_path, args.users_used
+                ))
+        ):
+            start = time.perf_counter()
+            password_list = function()
+            seconds = time.perf_counter() - start
+
+            print('{0:5} {1:12} {2:8.2f} s {3:8.1f} MB/s{4}'.format(
+                extension,
+                name,
+                seconds,
+                size / seconds / 1000000,
+                '' if (password_list == reference) else ' DIFFERENT OUTPUT'
+                ))
+
+
+if (__name__ == '__main__'):
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark of count-prefixed wordlist parsers
+
+Compares line by line regex parser, which was used by LoadRockYou,
+with memory mapped parser of scripts.countParser.
+
+Usage (from root of repository):
+    python -m benchmarks.loaderBenchmark --file inputs/rockyou-withcount.txt
+    python -m benchmarks.loaderBenchmark --lines 14344391
+
+Without --file synthetic file with --lines lines is generated.
+"""
+from scripts.countParser import iterateCountPrefixed
+
+import argparse
+import tempfile
+import random
+import time
+import os
+import re
+
+
+def regexParser(file_path, users_used):
+    """Parser used by LoadRockYou before countParser
+    """
+    password_list = []
+
+    with open(file_path, 'r', encoding='latin1') as inputfile:
+        regex_object = re.compile(r" *(\d+) (.*)")
+
+        for line in inputfile:
+            match = regex_object.match(line.rstrip('\n'))
+            if (match and
+               int(match.group(1)) >= users_used and match.group(2)):
+                password_list.append(match.group(2))
+
+    return password_list
+
+
+def mmapParser(file_path, users_used):
+    return [
+        password
+        for count, password in iterateCountPrefixed(file_path, users_used)
+        if (password)
+        ]
+
+
+def generateFile(file_path, lines, seed=0):
+    """Write count-prefixed wordlist, counts are sorted descending
+    and most passwords are used once, like in rockyou-withcount
+    """
+    rand = random.Random(seed)
+    alphabet = bytes(range(0x21, 0x7f)) + bytes(range(0xc0, 0x100))
+
+    with open(file_path, 'wb') as output_file:
+        for i in range(lines):
+            count = max(1, int(290000 / (i + 1) ** 0.9))
+            password = bytes(
+                rand.choice(alphabet) for j in range(rand.randint(4, 12))
+                )
+            output_file.write(b'%7d ' % count + password + b'\n')
+
+
+def measure(parser, file_path, users_used):
+    start = time.perf_counter()
+    password_list = parser(file_path, users_used)
+    return time.perf_counter() - start, password_list
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark parsers of count-prefixed wordlists'
+        )
+    parser.add_argument('--file', help='count-prefixed wordlist')
+    parser.add_argument(
+        '--lines', type=int, default=14344391,
+        help='lines of generated wordlist, default is size of rockyou'
+        )
+    parser.add_argument('--users-used', type=int, default=3)
+    args = parser.parse_args()
+
+    file_path = args.file
+    if (not file_path):
+        file_path = os.path.join(
+            tempfile.gettempdir(),
+            'pcl_wordlist_' + str(args.lines) + '.txt'
+            )
+        if (not os.path.exists(file_path)):
+            print("Generating " + file_path)
+            generateFile(file_path, args.lines)
+
+    size = os.path.getsize(file_path)
+    result_list = []
+    for name, function in (('regex', regexParser), ('mmap', mmapParser)):
+        seconds, password_list = measure(function, file_path, args.users_used)
+        result_list.append(password_list)
+        print(
+            '{0:6} {1:8.2f} s {2:8.1f} MB/s {3:>10} passwords'.format(
+                name,
+                seconds,
+                size / seconds / 1000000,
+                len(password_list)
+                )
+            )
+
+    if (result_list[0] != result_list[1]):
+        print("Parsers returned different passwords")
+
+
+if (__name__ == '__main__'):
+    main()
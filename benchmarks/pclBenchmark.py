@@ -0,0 +1,271 @@
+"""Throughput and memory benchmark of PassCheckLib
+
+Libraries are replaced by stubs from benchmarks/stubs, which print
+the same output format as real libraries with fixed simulated latency,
+so results can be compared between hosts and between commits.
+
+Every case (library, mode, corpus size) runs in new process,
+peak memory is maximum resident set size of that process
+and of its largest library subprocess.
+
+Usage (from root of repository):
+    python -m benchmarks.pclBenchmark
+    python -m benchmarks.pclBenchmark --sizes 10000 --library CrackLib
+"""
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+import scripts.passStruct as passStruct
+import scripts.libCheck as libCheck
+import multiprocessing
+import argparse
+import resource
+import random
+import string
+import json
+import time
+import sys
+import os
+
+
+STUB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stubs')
+
+WORKERS = os.cpu_count() or 1
+
+# library: {mode: options of library}
+CASES = {
+    'CrackLib': {
+        'default': {},
+        'stream': {'stream': True},
+        'workers': {'workers': WORKERS, 'chunk_size': 10000},
+    },
+    'PassWDQC': {
+        'default': {},
+        'stream': {'stream': True},
+        'workers': {'workers': WORKERS, 'chunk_size': 10000},
+    },
+    'ZxcvbnC': {
+        'default': {},
+        'stream': {'stream': True},
+        'workers': {'workers': WORKERS, 'chunk_size': 10000},
+    },
+    'Passfault': {
+        'default': {},
+        'stream': {'stream': True},
+        'server': {'backend': 'server', 'workers': WORKERS},
+    },
+    'Pwscore': {
+        'default': {},
+        'workers': {'workers': WORKERS},
+    },
+    'ZxcvbnPython': {
+        'default': {},
+        'workers': {'workers': WORKERS, 'chunk_size': 1000},
+    },
+}
+
+# Libraries checking one password by one process or by zxcvbn
+# in this process, big corpora would take hours
+SLOW_LIBRARIES = ('Pwscore', 'ZxcvbnPython')
+
+
+def generateCorpus(size, seed=0):
+    """Return list of size random passwords, about 10 % of them
+    are repeated like in leaked password lists
+    """
+    rand = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + '!@#$%&*'
+
+    password_list = []
+    for i in range(size):
+        if (password_list and rand.random() < 0.1):
+            password_list.append(rand.choice(password_list))
+        else:
+            password_list.append(''.join(
+                rand.choice(alphabet) for j in range(rand.randint(4, 16))
+                ))
+
+    return password_list
+
+
+def createLibrary(library, options):
+    """Return library with arguments pointing to stub executable
+    """
+    pcl = getattr(libCheck, library)(**options)
+
+    if (pcl.args):
+        stub = os.path.join(STUB_DIR, os.path.basename(pcl.args[0]))
+        pcl.args = (stub, ) + pcl.args[1:]
+
+    if (hasattr(pcl, 'server_pool')):
+        pcl.server_pool.args = pcl.args + ('-S', )
+
+    return pcl
+
+
+def getMaxRSS(who):
+    """Maximum resident set size in MiB
+    """
+    max_rss = resource.getrusage(who).ru_maxrss
+
+    # Linux reports KiB, macOS bytes
+    if (sys.platform == 'darwin'):
+        return max_rss / 1024 / 1024
+
+    return max_rss / 1024
+
+
+def runCase(library, mode, size, scale):
+    """Check corpus with one library in one mode,
+    runs in separate process
+
+    Return value:
+    dictionary with throughput, peak memory and phases of check
+    """
+    os.environ['PCL_STUB_SCALE'] = str(scale)
+
+    passinfo_list = [
+        passStruct.PassInfo(password) for password in generateCorpus(size)
+        ]
+    corpus_rss = getMaxRSS(resource.RUSAGE_SELF)
+
+    pass_check_lib = libCheck.PassCheckLib()
+    pcl = createLibrary(library, CASES[library][mode])
+    pass_check_lib.add(pcl)
+
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        start = time.perf_counter()
+        pass_check_lib.check(passinfo_list)
+        wall_time = time.perf_counter() - start
+
+    if (hasattr(pcl, 'close')):
+        pcl.close()
+
+    pcl_report = pass_check_lib.report['libraries'][library]
+
+    return {
+        'library': library,
+        'mode': mode,
+        'size': size,
+        'unique': pcl_report['passwords'],
+        'wall_time': wall_time,
+        'passwords_per_second': size / wall_time,
+        'corpus_rss_mb': corpus_rss,
+        'peak_rss_mb': getMaxRSS(resource.RUSAGE_SELF),
+        'peak_child_rss_mb': getMaxRSS(resource.RUSAGE_CHILDREN),
+        'phases': pcl_report['phases']
+    }
+
+
+def runBenchmark(
+    library_list, size_list, scale=1.0, slow_limit=10000, repeat=1
+        ):
+    """Run every case and return list of results
+
+    Arguments:
+    library_list -- list of library class names
+    size_list -- list of int, corpus sizes
+    scale -- float, multiplier of simulated latency of stubs
+    slow_limit -- int, maximum corpus size of slow libraries
+    repeat -- int, best of repeat runs is reported
+    """
+    result_list = []
+
+    for library in library_list:
+        for mode in CASES[library]:
+            for size in size_list:
+                if (library in SLOW_LIBRARIES and size > slow_limit):
+                    continue
+
+                best = None
+                for i in range(repeat):
+                    # New process for every run, so peak memory
+                    # is not affected by previous runs
+                    with ProcessPoolExecutor(
+                        max_workers=1,
+                        mp_context=multiprocessing.get_context('spawn')
+                    ) as executor:
+                        result = executor.submit(
+                            runCase, library, mode, size, scale
+                            ).result()
+
+                    if (
+                        best is None or
+                        result['wall_time'] < best['wall_time']
+                    ):
+                        best = result
+
+                printResult(best)
+                result_list.append(best)
+
+    return result_list
+
+
+def printResult(result):
+    print(
+        '{0:14} {1:8} {2:>9} {3:>12.1f}/s {4:>9.1f} MiB {5:>9.1f} MiB'.format(
+            result['library'],
+            result['mode'],
+            result['size'],
+            result['passwords_per_second'],
+            result['peak_rss_mb'],
+            result['peak_child_rss_mb']
+            )
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark PassCheckLib with stub libraries'
+        )
+    parser.add_argument(
+        '--library', action='append', choices=sorted(CASES),
+        help='library to benchmark, default is every library'
+        )
+    parser.add_argument(
+        '--sizes', nargs='+', type=int, default=[10000, 100000, 1000000],
+        help='corpus sizes'
+        )
+    parser.add_argument(
+        '--scale', type=float, default=1.0,
+        help='multiplier of simulated latency, 0 turns it off'
+        )
+    parser.add_argument(
+        '--slow-limit', type=int, default=10000,
+        help='maximum corpus size of ' + ', '.join(SLOW_LIBRARIES)
+        )
+    parser.add_argument(
+        '--repeat', type=int, default=1,
+        help='number of runs of every case, fastest is reported'
+        )
+    parser.add_argument(
+        '--output', default='outputs/pcl_benchmark.json',
+        help='json file with results'
+        )
+    args = parser.parse_args()
+
+    print(
+        '{0:14} {1:8} {2:>9} {3:>14} {4:>13} {5:>13}'.format(
+            'library', 'mode', 'size', 'throughput', 'peak RSS', 'child RSS'
+            )
+        )
+
+    result_list = runBenchmark(
+        args.library if (args.library) else list(CASES),
+        args.sizes,
+        args.scale,
+        args.slow_limit,
+        args.repeat
+        )
+
+    with open(args.output, 'w') as json_file:
+        json.dump({
+            'cpu_count': WORKERS,
+            'python': sys.version,
+            'scale': args.scale,
+            'results': result_list
+            }, json_file, indent=4)
+
+
+if (__name__ == '__main__'):
+    main()
@@ -0,0 +1,141 @@
+"""Stub password checking libraries used by benchmarks
+
+Every stub reads passwords from stdin and prints output in the same
+format as the real library, so libCheck parses it the same way.
+Output depends only on the password, latency is simulated by sleeping.
+
+Latency of stub is startup time plus time per password, both are
+multiplied by environment variable PCL_STUB_SCALE (default 1,
+0 turns off simulated latency).
+"""
+import hashlib
+import time
+import sys
+import os
+
+
+# (startup seconds, seconds per password) of every stub
+LATENCY = {
+    'cracklib-check': (0.002, 0.00002),
+    'pwqcheck': (0.002, 0.00001),
+    'pwscore': (0.02, 0.0005),
+    'test-file': (0.05, 0.00003),
+    'passfault': (0.5, 0.0002),
+}
+
+
+class Latency():
+
+    def __init__(self, name):
+        self.scale = float(os.environ.get('PCL_STUB_SCALE', '1'))
+        startup, self.per_password = LATENCY[name]
+        self.debt = 0.0
+
+        self.sleep(startup)
+
+    def sleep(self, seconds):
+        if (self.scale > 0):
+            time.sleep(seconds * self.scale)
+
+    def password(self):
+        """Add time of one password, sleep is done in bigger
+        steps because sleep for microseconds is not precise
+        """
+        self.debt += self.per_password * self.scale
+        if (self.debt >= 0.001):
+            time.sleep(self.debt)
+            self.debt = 0.0
+
+    def flush(self):
+        if (self.debt > 0):
+            time.sleep(self.debt)
+            self.debt = 0.0
+
+
+def passwordHash(password):
+    return int(hashlib.md5(bytes(password, 'UTF-8')).hexdigest()[:8], 16)
+
+
+def cracklibOutput(password):
+    if (len(password) < 6):
+        message = 'it is WAY too short'
+    elif (len(set(password)) < 5):
+        message = 'it does not contain enough DIFFERENT characters'
+    elif (passwordHash(password) % 4 == 0):
+        message = 'it is based on a dictionary word'
+    else:
+        message = 'OK'
+
+    return password + ': ' + message
+
+
+def pwqcheckOutput(password):
+    if (len(password) < 8):
+        return 'Bad passphrase (not enough different characters or ' + \
+            'classes for this length): ' + password
+    if (passwordHash(password) % 3 == 0):
+        return 'Bad passphrase (based on a common sequence of ' + \
+            'characters and a dictionary word): ' + password
+
+    return 'OK: ' + password
+
+
+def pwscoreOutput(password):
+    if (len(password) < 6):
+        return 'Password quality check failed:\n' + \
+            ' The password is shorter than 6 characters'
+
+    return str(min(100, len(password) * 5 + passwordHash(password) % 20))
+
+
+def zxcvbnOutput(password):
+    entropy = len(bytes(password, 'UTF-8')) * 2.5 + \
+        passwordHash(password) % 1000 / 100
+    return 'Pass ' + password + ' \tEntropy {0:.3f}'.format(entropy)
+
+
+def passfaultOutput(password):
+    if (not password):
+        return 'Rules found in password - ' + \
+            'Total complexity (size of smallest search space): 0'
+
+    return 'Rules found in password - \'' + password + \
+        '\': \'Word\' in \'English\';@; ' + \
+        'Total complexity (size of smallest search space): ' + \
+        str(len(password) ** 4 + passwordHash(password) % 1000)
+
+
+def runSinglePass(name, getOutput):
+    """One password on stdin without newline, like pwscore
+    """
+    latency = Latency(name)
+    password = sys.stdin.read()
+    latency.password()
+    latency.flush()
+
+    sys.stdout.write(getOutput(password) + '\n')
+
+
+def runMultiPass(name, getOutput, stop_on_empty=False, flush=False):
+    """One password per line, one output line per password
+
+    Arguments:
+    name -- string, name of stub in LATENCY
+    getOutput -- function returning output line of password
+    stop_on_empty -- boolean, stop on empty line like passfault
+    flush -- boolean, flush output after every password
+    """
+    latency = Latency(name)
+
+    for line in sys.stdin:
+        password = line.rstrip('\n')
+        if (stop_on_empty and not password):
+            break
+
+        latency.password()
+        sys.stdout.write(getOutput(password) + '\n')
+        if (flush):
+            latency.flush()
+            sys.stdout.flush()
+
+    latency.flush()
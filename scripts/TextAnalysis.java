@@ -48,7 +48,7 @@ public class TextAnalysis {
   private static PrintWriter outputFile;
   private static ArrayList matlabList;
   private static String matlabPath;
-  private static boolean time2crackGPU, time2crackSpeed, input, output, matlab, count;
+  private static boolean time2crackGPU, time2crackSpeed, input, output, matlab, count, server;
   private static String password;
   private static int machineNum, hashNum;
   private static float hashSpeed;
@@ -104,6 +104,7 @@ public class TextAnalysis {
     options.addOption("m", "matlab", true, "formatted output");
     options.addOption("v", "verbose", false, "verbose mode");
     options.addOption("h", "help", false, "help menu");
+    options.addOption("S", "server", false, "keep running, analyze every line from stdin and answer with exactly one line");
     options.addOption("W", "wordlists", true, "Directory for wordlists to override default wordlists");
     options.addOption("w", "wordlists", true, "Directory for wordlists to add to default wordlists");
 
@@ -230,6 +231,21 @@ public class TextAnalysis {
         matlab = true;
       }
 
+      if (line.hasOption("server")){
+        if (line.hasOption("input") || line.hasOption("password") || line.hasOption("output") || line.hasOption("matlab")){
+          System.out.println("CLI error: -S option reads passwords only from stdin. See help for more info.");
+          exit = true;
+        }
+
+        // Time to Crack adds lines to output, client reads one line per password
+        if (line.hasOption("hashSpeed") || line.hasOption("gpu") || line.hasOption("hashFunction")){
+          System.out.println("CLI error: -S option can't be used with Time to Crack analysis (-s, -g, -f). See help for more info.");
+          exit = true;
+        }
+
+        server = true;
+      }
+
       if (line.hasOption('W')) {
         String wordlistOverrideDirPath = line.getOptionValue('W');
         wordlistOverrideDir = new File(wordlistOverrideDirPath);
@@ -260,7 +276,9 @@ public class TextAnalysis {
     if (output || matlab)
       System.out.println("Please wait, results are being written to output file... ");
 
-    if (input){
+    if (server){
+      handleServer();
+    } else if (input){
       handleInputFile();
     } else if (password == null) {
       //System.out.println("Enter a password to analyze: ");
@@ -293,6 +311,21 @@ public class TextAnalysis {
     System.exit(0);
   }
 
+  private void handleServer() throws Exception {
+    // One output line for every input line, empty password included,
+    // so client can match answers with passwords
+    BufferedReader input = new BufferedReader(new InputStreamReader(System.in, "UTF-8"));
+    String l;
+    while ((l = input.readLine()) != null) {
+      if (l.length() != 0){
+        passwordAnalysis(l);
+      }else{
+        System.out.format("Rules found in password - Total complexity (size of smallest search space): 0\n");
+      }
+      System.out.flush();
+    }
+  }
+
   private void handleInputFile() throws Exception {
     int line = 0;
     double sumAnalysisTime = 0, analysisTime, remainingTime, avgAnalysisTime, done;
@@ -0,0 +1,148 @@
+import json
+import os
+import threading
+import time
+
+
+class AdaptiveTuner():
+
+    def __init__(
+        self, file_path='outputs/pcl_tuning.json', max_workers=None,
+        min_chunk_size=100, max_chunk_size=100000, tolerance=0.05
+            ):
+        """Tune chunk_size and workers of every library while
+        passwords are checked
+
+        Passwords are checked in rounds, throughput of every round
+        is measured. Neighbour settings (double or half of chunk_size
+        or workers) are tried and kept only if they are faster.
+        Best settings are saved to file_path and used by next run.
+
+        Arguments:
+        file_path -- path to json file with tuned settings
+        max_workers -- int, maximum number of workers, None means
+                       twice the number of CPUs
+        min_chunk_size -- int, minimum chunk size
+        max_chunk_size -- int, maximum chunk size
+        tolerance -- float, minimum relative improvement of throughput
+                     to accept new settings
+        """
+        self.file_path = file_path
+        self.max_workers = max_workers if (max_workers) \
+            else 2 * (os.cpu_count() or 1)
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.tolerance = tolerance
+        self.lock = threading.Lock()
+
+        self.settings = {}
+        if (os.path.exists(file_path)):
+            with open(file_path, 'r') as json_file:
+                self.settings = json.load(json_file)
+
+    def checkPasswordList(self, pcl, password_list, pcl_dic):
+        """Check passwords with library and tune its settings
+
+        Arguments:
+        pcl -- class Library
+        password_list -- list of passwords
+        pcl_dic -- dictionary
+        """
+        pcl_name = pcl.__class__.__name__
+
+        with self.lock:
+            if (pcl_name in self.settings):
+                pcl.chunk_size = self.settings[pcl_name]['chunk_size']
+                pcl.workers = self.settings[pcl_name]['workers']
+
+        best = (pcl.chunk_size, pcl.workers)
+        best_throughput = None
+        candidate_list = []
+
+        position = 0
+        while (position < len(password_list)):
+            chunk_size, workers = candidate_list.pop(0) \
+                if (candidate_list) else best
+            pcl.chunk_size = chunk_size
+            pcl.workers = workers
+
+            round_list = password_list[
+                position:position + self.getRoundSize(pcl)
+                ]
+            position += len(round_list)
+
+            start = time.perf_counter()
+            pcl.checkPasswordList(round_list, pcl_dic)
+            throughput = len(round_list) / \
+                max(time.perf_counter() - start, 1e-9)
+
+            if (best_throughput is None):
+                best_throughput = throughput
+                candidate_list = self.getNeighbours(pcl, best)
+            elif (throughput > best_throughput * (1 + self.tolerance)):
+                # Faster settings found, try their neighbours
+                best = (chunk_size, workers)
+                best_throughput = throughput
+                candidate_list = self.getNeighbours(pcl, best)
+            elif ((chunk_size, workers) == best):
+                best_throughput = throughput
+
+        pcl.chunk_size, pcl.workers = best
+
+        if (best_throughput is not None):
+            print(
+                "Tuning: chunk_size " + str(best[0]) +
+                ", workers " + str(best[1]) +
+                ", {0:.1f} passwords/s".format(best_throughput)
+                )
+            self.save(pcl_name, best, best_throughput)
+
+    @staticmethod
+    def isChunked(pcl):
+        """True if chunk_size of library is tuned, library is multi pass
+        or checks chunks by its own pool of processes (ZxcvbnPython)
+        """
+        return not pcl.single_pass or pcl.pool_chunks
+
+    @staticmethod
+    def getRoundSize(pcl):
+        """Number of passwords in one measured round, every worker
+        of chunked library gets two chunks, so start of pool
+        doesn't take most of the round
+        """
+        if (not AdaptiveTuner.isChunked(pcl)):
+            return max(pcl.workers, 1) * 20
+
+        return pcl.chunk_size * max(pcl.workers, 1) * 2
+
+    def getNeighbours(self, pcl, settings):
+        chunk_size, workers = settings
+        neighbour_list = [
+            (chunk_size, min(workers * 2, self.max_workers)),
+            (chunk_size, max(workers // 2, 1))
+            ]
+
+        # Chunk size doesn't matter for single pass library without pool
+        if (self.isChunked(pcl)):
+            neighbour_list += [
+                (min(chunk_size * 2, self.max_chunk_size), workers),
+                (max(chunk_size // 2, self.min_chunk_size), workers)
+                ]
+
+        return [
+            neighbour for neighbour in neighbour_list
+            if (neighbour != settings)
+            ]
+
+    def save(self, pcl_name, settings, throughput):
+        with self.lock:
+            self.settings.update({
+                pcl_name: {
+                    'chunk_size': settings[0],
+                    'workers': settings[1],
+                    'throughput': throughput
+                }
+            })
+
+            with open(self.file_path, 'w') as json_file:
+                json.dump(self.settings, json_file, sort_keys=True, indent=4)
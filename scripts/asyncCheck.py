@@ -0,0 +1,282 @@
+from itertools import islice
+from scripts.libCheck import PassCheckLib, Library, CheckPlan
+
+import scripts.errorPrinter as errorPrinter
+import asyncio
+
+
+# Output stored for passwords, which library didn't check before timeout
+TIMEOUT_OUTPUT = ('timeout', None)
+
+
+class AsyncPassCheckLib(PassCheckLib):
+
+    def __init__(self, timeout=None, queue_size=1000):
+        """Check passwords with every library from one asyncio event loop
+
+        Library in subprocess is run by asyncio subprocesses,
+        library in this process or with other backend (ctypes,
+        pwquality, passfault server) runs its checkPasswordList
+        in thread, timeout doesn't apply to it
+
+        Cache, journal, tuner and report of PassCheckLib
+        are not used by async check
+
+        Arguments:
+        timeout -- float, seconds for one library process, None means
+                   no limit, process gets one password of single pass
+                   library or one chunk of multi pass library,
+                   it is killed when timeout expires and its passwords
+                   get output TIMEOUT_OUTPUT
+        queue_size -- int, maximum number of items waiting in queues
+                      between producers and consumers
+        """
+        super(AsyncPassCheckLib, self).__init__()
+        self.timeout = timeout
+        self.queue_size = queue_size
+
+    def checkPasswordList(self, password_list, plan=None, verbose=True):
+        """Check every password from list of strings with every
+        password checking library from list
+
+        Arguments:
+        password_list -- list of passwords
+        plan -- class CheckPlan of password_list, created if None
+        verbose -- boolean, if false progress and dedup are not printed
+
+        Return value:
+        pcl_dic -- dictionary, key=string value=dictionary
+        """
+        if (verbose):
+            print("Checking passwords...")
+
+        if (self.cache or self.journal or self.tuner or self.report_path):
+            errorPrinter.printWarning(
+                self.__class__.__name__,
+                'Cache, journal, tuner and report are not used by async check'
+                )
+
+        plan = plan if (plan) else CheckPlan(password_list)
+        if (verbose):
+            plan.printReport(len(self.single_pcl_list + self.multi_pcl_list))
+
+        pcl_dic = {password: {} for password in plan.password_list}
+
+        pcl_output_list = asyncio.run(
+            self.checkAsync(plan.password_list, verbose)
+            )
+        for pcl_output_dic in pcl_output_list:
+            self.mergePCLOutput(pcl_dic, pcl_output_dic)
+
+        if (verbose):
+            print("Checking passwords DONE\n")
+
+        return pcl_dic
+
+    async def checkAsync(self, password_list, verbose=True):
+        """Run every library at once, if one library fails,
+        other libraries are cancelled
+
+        Return value:
+        list of dictionaries with outputs of every library
+        """
+        task_list = [
+            asyncio.ensure_future(
+                self.checkWithPCLAsync(pcl, password_list, verbose)
+                )
+            for pcl in self.single_pcl_list + self.multi_pcl_list
+            ]
+
+        try:
+            return await asyncio.gather(*task_list)
+        except BaseException:
+            for task in task_list:
+                task.cancel()
+            await asyncio.gather(*task_list, return_exceptions=True)
+            raise
+
+    async def checkWithPCLAsync(self, pcl, password_list, verbose=True):
+        if (verbose):
+            print("PCL: " + pcl.__class__.__name__)
+
+        pcl_dic = {}
+        for password in password_list:
+            pcl_dic.update({password: {}})
+
+        if (pcl.in_process or pcl.backend != 'subprocess'):
+            # Library doesn't run args, don't block the event loop
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                pcl.checkPasswordList,
+                password_list,
+                pcl_dic
+                )
+        elif (pcl.single_pass):
+            await self.checkSinglePassAsync(pcl, password_list, pcl_dic)
+        else:
+            await self.checkMultiPassAsync(pcl, password_list, pcl_dic)
+
+        return pcl_dic
+
+    async def checkSinglePassAsync(self, pcl, password_list, pcl_dic):
+        """Check passwords one by one, with pcl.workers
+        library processes running at once
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        workers = max(pcl.workers, 1)
+        timeouts = []
+
+        async def producePasswords():
+            for password in password_list:
+                await queue.put(password)
+            for i in range(workers):
+                await queue.put(None)
+
+        async def consumePasswords():
+            while (True):
+                password = await queue.get()
+                if (password is None):
+                    return
+
+                output = await self.getPCLOutputAsync(pcl, password)
+                if (output is None):
+                    timeouts.append(password)
+                    pcl.storePCLOutput(pcl_dic, password, TIMEOUT_OUTPUT)
+                else:
+                    pcl.storePCLOutput(
+                        pcl_dic,
+                        password,
+                        pcl.convertOutput(output)
+                        )
+
+        await asyncio.gather(
+            producePasswords(),
+            *[consumePasswords() for i in range(workers)]
+            )
+
+        if (timeouts):
+            errorPrinter.printWarning(
+                pcl.__class__.__name__,
+                str(len(timeouts)) + ' passwords timed out'
+                )
+
+    async def checkMultiPassAsync(self, pcl, password_list, pcl_dic):
+        """Check passwords in chunks of pcl.chunk_size, every chunk
+        in its own library process, with pcl.workers processes
+        running at once, timeout loses only one chunk
+        """
+        semaphore = asyncio.Semaphore(max(pcl.workers, 1))
+        timeouts = []
+
+        async def checkChunk(chunk):
+            async with semaphore:
+                output = await self.getPCLOutputAsync(pcl, chunk)
+
+            if (output is None):
+                timeouts.extend(chunk)
+                pcl.storePCLOutput(
+                    pcl_dic,
+                    chunk,
+                    [TIMEOUT_OUTPUT] * len(chunk)
+                    )
+            else:
+                pcl.storePCLOutput(pcl_dic, chunk, pcl.convertOutput(output))
+
+        await asyncio.gather(*[
+            checkChunk(password_list[i:i + pcl.chunk_size])
+            for i in range(0, len(password_list), pcl.chunk_size)
+            ])
+
+        if (timeouts):
+            errorPrinter.printWarning(
+                pcl.__class__.__name__,
+                str(len(timeouts)) + ' passwords timed out'
+                )
+
+    async def getPCLOutputAsync(self, pcl, password_input):
+        """Run library process for one password or list of passwords
+
+        Input is written in chunks and drained, so writing waits
+        for the library. Output lines go through bounded queue to parser.
+
+        Return value:
+        resolved output like Library.getPCLOutput,
+        None if library timed out
+        """
+        process = await asyncio.create_subprocess_exec(
+            *pcl.args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT
+            )
+
+        if (pcl.single_pass):
+            communicate = process.communicate(
+                input=bytes(password_input, 'UTF-8')
+                )
+        else:
+            communicate = self.communicateStream(
+                process,
+                password_input,
+                pcl.delimiter,
+                pcl.chunk_size
+                )
+
+        try:
+            output = await asyncio.wait_for(communicate, self.timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return None
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+
+        if (pcl.single_pass):
+            return Library.resolveOutput(
+                output[0].decode('UTF-8'),
+                pcl.delimiter
+                )
+
+        return output
+
+    async def communicateStream(
+        self, process, password_list, delimiter, chunk_size
+            ):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        output_list = []
+
+        async def writeInput():
+            password_iter = iter(password_list)
+            while (True):
+                chunk = list(islice(password_iter, chunk_size))
+                if (not chunk):
+                    break
+
+                process.stdin.write(bytes('\n'.join(chunk) + '\n', 'UTF-8'))
+                await process.stdin.drain()
+            process.stdin.close()
+
+        async def readOutput():
+            while (True):
+                line = await process.stdout.readline()
+                await queue.put(line)
+                if (not line):
+                    return
+
+        async def parseOutput():
+            while (True):
+                line = await queue.get()
+                if (not line):
+                    return
+
+                output_list.append(Library.resolveOutput(
+                    line.decode('UTF-8'),
+                    delimiter
+                    ))
+
+        await asyncio.gather(writeInput(), readOutput(), parseOutput())
+        await process.wait()
+
+        return output_list
@@ -0,0 +1,117 @@
+import json
+import os
+import threading
+
+
+class CheckJournal():
+
+    def __init__(
+        self, file_path='outputs/check_journal.jsonl', checkpoint=10000
+            ):
+        """Journal of finished password checks, used to resume
+        interrupted PassCheckLib.check
+
+        Every line of journal is one checkpoint of one library,
+        json object with keys 'pcl', 'fingerprint' and 'output'
+
+        Arguments:
+        file_path -- path to journal file, existing journal is resumed
+        checkpoint -- int, number of passwords checked by library
+                      between two writes to journal
+        """
+        self.file_path = file_path
+        self.checkpoint = checkpoint
+        self.lock = threading.Lock()
+        self.pcl_output = None
+
+    def load(self):
+        """Read every finished checkpoint from journal
+        """
+        self.pcl_output = {}
+        if (not os.path.exists(self.file_path)):
+            return
+
+        with open(self.file_path, 'r', encoding='UTF-8') as journal_file:
+            for line in journal_file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Line cut by crash, skip it
+                    continue
+
+                key = (record['pcl'], record['fingerprint'])
+                if (key not in self.pcl_output):
+                    self.pcl_output.update({key: {}})
+
+                for password, output, score in record['output']:
+                    self.pcl_output[key].update({password: (output, score)})
+
+    def get(self, pcl, password_dic):
+        """Return outputs of library already stored in journal
+
+        Arguments:
+        pcl -- class Library
+        password_dic -- dictionary or set of checked passwords
+
+        Return value:
+        pcl_output_dic -- dictionary, key=password value=(output, score)
+        """
+        with self.lock:
+            if (self.pcl_output is None):
+                self.load()
+
+            journal_output = self.pcl_output.get(
+                (pcl.__class__.__name__, pcl.getFingerprint()),
+                {}
+                )
+
+        return {
+            password: output
+            for password, output in journal_output.items()
+            if (password in password_dic)
+            }
+
+    def store(self, pcl, pcl_output_dic):
+        """Append one checkpoint of library to journal
+
+        Arguments:
+        pcl -- class Library
+        pcl_output_dic -- dictionary, key=password value=(output, score)
+        """
+        if (not pcl_output_dic):
+            return
+
+        record = json.dumps({
+            'pcl': pcl.__class__.__name__,
+            'fingerprint': pcl.getFingerprint(),
+            'output': [
+                [password, output[0], output[1]]
+                for password, output in pcl_output_dic.items()
+                ]
+            })
+
+        with self.lock:
+            if (self.pcl_output is not None):
+                key = (pcl.__class__.__name__, pcl.getFingerprint())
+                if (key not in self.pcl_output):
+                    self.pcl_output.update({key: {}})
+                self.pcl_output[key].update(pcl_output_dic)
+
+            with open(self.file_path, 'a+b') as journal_file:
+                # Line cut by crash would swallow start of this record
+                if (journal_file.seek(0, os.SEEK_END)):
+                    journal_file.seek(-1, os.SEEK_END)
+                    if (journal_file.read(1) != b'\n'):
+                        record = '\n' + record
+
+                journal_file.write(bytes(record + '\n', 'UTF-8'))
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+
+    def clear(self):
+        """Remove journal, next check starts from the beginning
+        """
+        with self.lock:
+            if (os.path.exists(self.file_path)):
+                os.remove(self.file_path)
+            self.pcl_output = None
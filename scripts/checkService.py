@@ -0,0 +1,253 @@
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import scripts.errorPrinter as errorPrinter
+import threading
+import queue
+import json
+import time
+
+
+class CheckRequest():
+
+    def __init__(self, password_list):
+        self.password_list = password_list
+        self.start = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher():
+
+    def __init__(self, pass_check_lib, max_batch=256, max_delay=0.01):
+        """Group concurrent requests to one check, so every library
+        process is started once for whole batch
+
+        Arguments:
+        pass_check_lib -- class PassCheckLib with added libraries
+        max_batch -- int, maximum number of passwords in one batch
+        max_delay -- float, seconds the first request of batch
+                     waits for other requests
+        """
+        self.pass_check_lib = pass_check_lib
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue = queue.Queue()
+        self.stats = ServiceStats()
+
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, password_list):
+        """Check passwords, wait for result of batch
+
+        Return value:
+        pcl_dic -- dictionary, key=string value=dictionary
+        """
+        request = CheckRequest(password_list)
+        self.queue.put(request)
+        request.done.wait()
+
+        if (request.error):
+            raise request.error
+
+        return request.result
+
+    def run(self):
+        while (True):
+            request_list = [self.queue.get()]
+            password_count = len(request_list[0].password_list)
+            deadline = time.perf_counter() + self.max_delay
+
+            while (password_count < self.max_batch):
+                timeout = deadline - time.perf_counter()
+                if (timeout <= 0):
+                    break
+                try:
+                    request = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+                request_list.append(request)
+                password_count += len(request.password_list)
+
+            self.checkBatch(request_list)
+
+    def checkBatch(self, request_list):
+        password_dic = {}
+        for request in request_list:
+            for password in request.password_list:
+                password_dic[password] = None
+
+        try:
+            # Service checks many small batches, progress of every batch
+            # is not printed
+            pcl_dic = self.pass_check_lib.checkPasswordList(
+                list(password_dic.keys()),
+                verbose=False
+                )
+        except BaseException as err:
+            # Library can call exit(), batcher thread must keep running,
+            # otherwise every next request waits forever
+            errorPrinter.printWarning(self.__class__.__name__, repr(err))
+            pcl_dic = None
+
+        for request in request_list:
+            if (pcl_dic is None):
+                request.error = Exception('Password check failed')
+            else:
+                request.result = {
+                    password: pcl_dic[password]
+                    for password in request.password_list
+                    }
+            request.done.set()
+
+        self.stats.addBatch(request_list)
+
+
+class ServiceStats():
+
+    def __init__(self, window=10000):
+        """Latency and throughput counters of service
+
+        Arguments:
+        window -- int, number of last requests used for percentiles
+        """
+        self.lock = threading.Lock()
+        self.start = time.time()
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.passwords = 0
+        self.batches = 0
+
+    def addBatch(self, request_list):
+        now = time.perf_counter()
+        with self.lock:
+            self.batches += 1
+            for request in request_list:
+                self.requests += 1
+                self.passwords += len(request.password_list)
+                self.latencies.append(now - request.start)
+
+    def getStats(self):
+        with self.lock:
+            latency_list = sorted(self.latencies)
+            uptime = time.time() - self.start
+
+            def percentile(value):
+                if (not latency_list):
+                    return None
+                return latency_list[min(
+                    int(value * len(latency_list)),
+                    len(latency_list) - 1
+                    )]
+
+            return {
+                'requests': self.requests,
+                'passwords': self.passwords,
+                'batches': self.batches,
+                'uptime': uptime,
+                'requests_per_second': self.requests / uptime,
+                'passwords_per_second': self.passwords / uptime,
+                'latency_p50': percentile(0.5),
+                'latency_p99': percentile(0.99)
+            }
+
+
+class CheckRequestHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        """POST /check with json {"passwords": [...]} or {"password": ...}
+        returns json {password: {pcl: [output, score]}}
+        """
+        if (self.path != '/check'):
+            self.sendJson(404, {'error': 'Not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            data = json.loads(self.rfile.read(length).decode('UTF-8'))
+            if (type(data) is not dict):
+                raise ValueError("expected object with 'passwords' list")
+            password_list = data['passwords'] if ('passwords' in data) \
+                else [data['password']]
+            if (type(password_list) is not list):
+                raise ValueError('Passwords must be list')
+            if (not all(type(password) is str for password in password_list)):
+                raise ValueError('Passwords must be strings')
+        except (ValueError, KeyError, TypeError) as err:
+            self.sendJson(400, {'error': str(err)})
+            return
+
+        if (not password_list):
+            self.sendJson(200, {})
+            return
+
+        try:
+            result = self.server.batcher.submit(password_list)
+        except Exception as err:
+            self.sendJson(500, {'error': str(err)})
+            return
+
+        self.sendJson(200, result)
+
+    def do_GET(self):
+        """GET /stats returns latency and throughput counters
+        """
+        if (self.path != '/stats'):
+            self.sendJson(404, {'error': 'Not found'})
+            return
+
+        self.sendJson(200, self.server.batcher.stats.getStats())
+
+    def sendJson(self, code, data):
+        body = bytes(json.dumps(data), 'UTF-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CheckHTTPServer(ThreadingHTTPServer):
+
+    # Many clients connect at once, default backlog is 5
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class CheckService():
+
+    def __init__(
+        self, pass_check_lib, address=('127.0.0.1', 8080),
+        max_batch=256, max_delay=0.01
+            ):
+        """Local HTTP service for checking passwords by PassCheckLib
+
+        Arguments:
+        pass_check_lib -- class PassCheckLib with added libraries
+        address -- (host, port) tuple
+        max_batch -- int, maximum number of passwords in one batch
+        max_delay -- float, seconds request waits for other requests
+        """
+        self.server = CheckHTTPServer(address, CheckRequestHandler)
+        self.server.batcher = MicroBatcher(
+            pass_check_lib,
+            max_batch,
+            max_delay
+            )
+
+    def serve_forever(self):
+        print(
+            "Serving on http://" + self.server.server_address[0] + ':' +
+            str(self.server.server_address[1])
+            )
+        self.server.serve_forever()
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,180 @@
+import threading
+import queue
+import re
+import lzma
+import gzip
+import time
+import bz2
+import io
+import os
+
+
+# Magic bytes at the beginning of compressed file
+MAGIC_LIST = [
+    # Magic and deflate, the only compression method of gzip
+    (re.compile(b'\x1f\x8b\x08'), gzip),
+    # 'BZh', block size digit and magic of first block (or end of stream)
+    (re.compile(b'BZh[1-9](1AY&SY|\x17rE8P\x90)'), bz2),
+    (re.compile(b'\xfd7zXZ\x00'), lzma),
+]
+
+
+def getCompression(file_path):
+    """Return module (gzip, bz2, lzma) which decompresses file,
+    None if file is not compressed
+    """
+    with open(file_path, 'rb') as input_file:
+        header = input_file.read(10)
+
+    for magic, module in MAGIC_LIST:
+        if (magic.match(header)):
+            return module
+
+    return None
+
+
+def openFile(file_path, mode='rb', encoding=None):
+    """Open file like open(), compressed file is decompressed
+    in background thread while it is read
+
+    Arguments:
+    file_path -- path to plain or compressed file
+    mode -- 'rb' or 'r'
+    encoding -- encoding of text mode
+    """
+    module = getCompression(file_path)
+    if (module is None):
+        if (mode == 'rb'):
+            return open(file_path, mode)
+        return open(file_path, mode, encoding=encoding)
+
+    raw_file = open(file_path, 'rb')
+    binary_file = io.BufferedReader(
+        ThreadedReader(module.open(raw_file, 'rb'), raw_file),
+        buffer_size=1 << 20
+        )
+
+    if (mode == 'rb'):
+        return binary_file
+    return io.TextIOWrapper(binary_file, encoding=encoding)
+
+
+class ThreadedReader(io.RawIOBase):
+
+    def __init__(
+        self, stream, raw_file=None, block_size=1 << 20, queue_size=16
+            ):
+        """Read decompressed blocks of stream in background thread,
+        decompression runs while previous blocks are parsed
+
+        Throughput of decompression is printed when file is closed
+
+        Arguments:
+        stream -- decompressing file object, e.g. gzip.GzipFile
+        raw_file -- compressed file under stream, closed with stream
+        block_size -- int, bytes read from stream at once
+        queue_size -- int, maximum number of blocks waiting for reader
+        """
+        self.stream = stream
+        self.raw_file = raw_file
+        self.block_size = block_size
+        self.queue = queue.Queue(queue_size)
+        self.buffer = memoryview(b'')
+        self.eof = False
+
+        self.stop = threading.Event()
+        self.start = time.perf_counter()
+        self.decompress_time = None
+        self.wait_time = 0.0
+        self.bytes_out = 0
+
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        try:
+            while (not self.stop.is_set()):
+                block = self.stream.read(self.block_size)
+                self.bytes_out += len(block)
+                self.put(block)
+
+                if (not block):
+                    break
+        except Exception as err:
+            self.put(err)
+
+        self.decompress_time = time.perf_counter() - self.start
+
+    def put(self, item):
+        # Reader could be closed before end of stream
+        while (not self.stop.is_set()):
+            try:
+                self.queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while (not self.buffer and not self.eof):
+            start = time.perf_counter()
+            item = self.queue.get()
+            self.wait_time += time.perf_counter() - start
+
+            if (isinstance(item, Exception)):
+                # Thread ended, next read must not wait for it
+                self.eof = True
+                raise item
+            if (not item):
+                self.eof = True
+            self.buffer = memoryview(item)
+
+        size = min(len(buffer), len(self.buffer))
+        buffer[:size] = self.buffer[:size]
+        self.buffer = self.buffer[size:]
+
+        return size
+
+    def getStats(self):
+        """Return dictionary with sizes and throughput of decompression
+        """
+        seconds = self.decompress_time if (self.decompress_time) \
+            else time.perf_counter() - self.start
+        bytes_in = os.fstat(self.raw_file.fileno()).st_size \
+            if (self.raw_file) else None
+
+        return {
+            'bytes_in': bytes_in,
+            'bytes_out': self.bytes_out,
+            'seconds': seconds,
+            'mb_per_second': self.bytes_out / seconds / 1000000,
+            'wait_time': self.wait_time
+        }
+
+    def printStats(self):
+        stats = self.getStats()
+        print(
+            "Decompression: " +
+            ("{0:.1f} MB -> ".format(stats['bytes_in'] / 1000000)
+                if (stats['bytes_in'] is not None) else "") +
+            "{0:.1f} MB in {1:.2f} s, {2:.1f} MB/s, ".format(
+                stats['bytes_out'] / 1000000,
+                stats['seconds'],
+                stats['mb_per_second']
+                ) +
+            "reader waited {0:.2f} s".format(stats['wait_time'])
+            )
+
+    def close(self):
+        if (not self.closed):
+            self.stop.set()
+            self.thread.join()
+            self.printStats()
+
+            self.stream.close()
+            if (self.raw_file):
+                self.raw_file.close()
+
+        super(ThreadedReader, self).close()
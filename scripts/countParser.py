@@ -0,0 +1,129 @@
+from scripts.lineIndex import LineIndex
+from scripts.compressedFile import getCompression, openFile
+
+import mmap
+import os
+
+
+def splitLines(block):
+    """Split block of file to lines like file opened in text mode,
+    '\\r\\n' and single '\\r' end line too
+    """
+    line_list = block.split(b'\n')
+
+    # Block ends with '\n', last item is not a line
+    if (not line_list[-1]):
+        line_list.pop()
+
+    if (b'\r' not in block):
+        return line_list
+
+    cr_line_list = []
+    for line in line_list:
+        if (line[-1:] == b'\r'):
+            line = line[:-1]
+        cr_line_list += line.split(b'\r')
+
+    return cr_line_list
+
+
+def parseLines(line_list, users_used=0):
+    """Yield (count, password) of count-prefixed lines
+    with count at least users_used
+    """
+    for line in line_list:
+        count, space, password = line.lstrip(b' ').partition(b' ')
+        if (space and count.isdigit()):
+            count = int(count)
+            if (count >= users_used):
+                yield count, password.decode('latin1')
+
+
+def iterateCountPrefixed(
+    file_path, users_used=0, start=None, end=None, block_size=1 << 24
+        ):
+    """Yield (count, password) from rockyou-withcount file,
+    lines in format ' *(count) (password)', password is latin1
+
+    File is memory mapped and split to lines by blocks, count
+    is compared with users_used before password is decoded,
+    lines in other format are skipped
+
+    Compressed file (gzip, bz2, xz) is decompressed while it is read,
+    lines before start are read too, because stream can't seek
+
+    Arguments:
+    file_path -- path to count-prefixed wordlist
+    users_used -- int, lines with lower count are skipped
+    start -- first line, lines before it are skipped by LineIndex
+    end -- last line
+    block_size -- int, bytes split to lines at once
+    """
+    line_number = 0
+
+    if (getCompression(file_path)):
+        block_iter = iterateStreamBlocks(file_path, block_size)
+    else:
+        position = 0
+        if (start):
+            line_number, position = LineIndex(
+                file_path,
+                'latin1'
+                ).getEntry(start)
+
+            # Position with state of text decoder is not offset
+            if (position is None or position >> 64):
+                line_number, position = 0, 0
+
+        block_iter = iterateMappedBlocks(file_path, position, block_size)
+
+    for block in block_iter:
+        line_list = splitLines(block)
+
+        # Lines out of start and end are cut from whole block
+        first = line_number
+        line_number += len(line_list)
+        line_list = line_list[
+            max(start - first - 1, 0) if (start) else 0:
+            max(end - first, 0) if (end) else len(line_list)
+            ]
+
+        yield from parseLines(line_list, users_used)
+
+        if (end and line_number >= end):
+            return
+
+
+def iterateMappedBlocks(file_path, position, block_size):
+    """Yield blocks of memory mapped file from position,
+    every block ends with whole line
+    """
+    with open(file_path, 'rb') as input_file:
+        size = os.fstat(input_file.fileno()).st_size
+        if (not size):
+            return
+
+        with mmap.mmap(
+            input_file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as data:
+            while (position < size):
+                block_end = data.find(
+                    b'\n',
+                    min(position + block_size, size) - 1
+                    )
+                block_end = size if (block_end == -1) else block_end + 1
+
+                yield data[position:block_end]
+                position = block_end
+
+
+def iterateStreamBlocks(file_path, block_size):
+    """Yield blocks of compressed file, every block ends with whole line
+    """
+    with openFile(file_path, 'rb') as input_file:
+        while (True):
+            block = input_file.read(block_size)
+            if (not block):
+                return
+
+            yield block + input_file.readline()
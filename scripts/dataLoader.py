@@ -1,13 +1,24 @@
 from abc import ABCMeta, abstractmethod
 from scripts.passStruct import PassInfo
+from scripts.lineIndex import CSVIndex
+from scripts.countParser import iterateCountPrefixed, parseLines, splitLines
+from scripts.compressedFile import getCompression, openFile
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from itertools import islice
 
 import scripts.errorPrinter as errorPrinter
+import struct
+import gc
+import array
+import mmap
+import math
 import sys
 import os
+import io
 import json
 import csv
 import copy
-import re
 
 
 class Loader():
@@ -54,10 +65,33 @@ class Loader():
         print('Loading DONE\n')
         return data
 
+    def iterate(self):
+        """Yield passwords one by one, input is read lazily,
+        so whole input is never in memory
+        """
+        print('Streaming data... using ' + self.__class__.__name__)
+
+        try:
+            for data in self.iterate_data():
+                yield data
+        except IOError:
+            errorPrinter.printError(
+                self.__class__.__name__,
+                'File \'{0:1}\' doesn\'t exist'.format(self.file_path)
+            )
+
+        print('Streaming DONE\n')
+
     @abstractmethod
     def load_data(self):
         pass
 
+    def iterate_data(self):
+        errorPrinter.printError(
+            self.__class__.__name__,
+            'Streaming is not supported'
+            )
+
 
 class LoadFromStdin(Loader):
 
@@ -68,13 +102,11 @@ class LoadFromStdin(Loader):
 
         Method return -- password_list of type list
         """
-        password_list = []
+        return list(self.iterate_data())
 
+    def iterate_data(self):
         for line in sys.stdin:
-            password = line.rstrip('\n')
-            password_list.append(password)
-
-        return password_list
+            yield line.rstrip('\n')
 
 
 class LoadFromFile(Loader):
@@ -88,48 +120,276 @@ class LoadFromFile(Loader):
         """Load passwords from file
 
         Input format -- password(string)
+                        file can be compressed by gzip, bz2 or xz
 
         Method return -- password_list of type list
         """
-        password_list = []
+        return list(self.iterate_data())
 
-        with open(self.file_path, 'r', encoding=self.encoding) as inputfile:
+    def iterate_data(self):
+        with openFile(self.file_path, 'r', self.encoding) as inputfile:
             for line in inputfile:
-                password = line.rstrip('\n')
-                password_list.append(password)
-
-        return password_list
+                yield line.rstrip('\n')
 
 
 class LoadRockYou(Loader):
 
     def __init__(self, file_path=None, start=None, end=None, users_used=3):
+        """
+        Arguments:
+        file_path -- path to rockyou-withcount file,
+                     file can be compressed by gzip, bz2 or xz
+        start -- first loaded line, lines before it are skipped
+                 by index stored to file_path + '.idx'
+        end -- last loaded line
+        users_used -- minimum number of users of password
+        """
         super(LoadRockYou, self).__init__()
         self.file_path = file_path
         self.start = start
         self.end = end
         self.users_used = users_used
 
+    def load_data(self):
+        return list(self.iterate_data())
+
+    def iterate_data(self):
+        for count, password in iterateCountPrefixed(
+            self.file_path,
+            self.users_used,
+            self.start,
+            self.end
+        ):
+            if (password):
+                yield password
+
+
+class LoadSharded(Loader):
+
+    def __init__(
+        self, file_path=None, file_format='plain', encoding='UTF-8',
+        users_used=3, workers=None, shards=None
+            ):
+        """Load wordlist by processes, file is split to byte ranges
+        ending with new line and every range is parsed by one process
+
+        Arguments:
+        file_path -- path to wordlist
+        file_format -- 'plain' like LoadFromFile,
+                       'count' like LoadRockYou (rockyou-withcount)
+        encoding -- encoding of 'plain' file, new line must be one byte
+        users_used -- minimum number of users of password, 'count' only
+        workers -- int, number of processes, None means number of CPUs
+        shards -- int, number of byte ranges, None means 4 * workers
+        """
+        super(LoadSharded, self).__init__()
+        self.file_path = file_path
+        self.file_format = file_format
+        self.encoding = encoding
+        self.users_used = users_used
+        self.workers = workers if (workers) else (os.cpu_count() or 1)
+        self.shards = shards if (shards) else 4 * self.workers
+
+        if (file_format not in ('plain', 'count')):
+            errorPrinter.printError(
+                self.__class__.__name__,
+                'Unknown file format \'' + str(file_format) + '\''
+                )
+
     def load_data(self):
         password_list = []
+        for shard in self.iterate_shards():
+            password_list += shard
 
-        with open(self.file_path, 'r', encoding='latin1') as inputfile:
-            regex_object = re.compile(r" *(\d+) (.*)")
-            linecounter = 0
+        return password_list
 
-            for line in inputfile:
-                linecounter += 1
-                if (self.start and linecounter < self.start):
-                    continue
-                if (self.end and linecounter > self.end):
+    def iterate_data(self):
+        for shard in self.iterate_shards():
+            yield from shard
+
+    def iterate_shards(self):
+        """Yield password list of every shard in order of file
+        """
+        return self.mapShards(None)
+
+    def mapShards(self, function):
+        """Load shards and call function with password list of shard
+        in the same process, so loaded passwords are not sent back
+
+        Arguments:
+        function -- picklable function or class with __call__,
+                    e.g. TransformAndCheckShard, None returns passwords
+
+        Return value:
+        generator of results of function in order of shards
+        """
+        if (getCompression(self.file_path)):
+            errorPrinter.printError(
+                self.__class__.__name__,
+                'Compressed file can\'t be split to byte ranges, ' +
+                'use LoadFromFile or LoadRockYou'
+                )
+
+        range_list = self.getByteRanges(self.file_path, self.shards)
+
+        # One process, don't send shards between processes
+        if (self.workers <= 1):
+            for start, end in range_list:
+                yield loadByteRange(
+                    self.file_path,
+                    start,
+                    end,
+                    self.file_format,
+                    self.encoding,
+                    self.users_used,
+                    function
+                    )
+            return
+
+        if (hasattr(function, 'checkShareable')):
+            function.checkShareable()
+
+        # Only 2 * workers shards are submitted at once, results
+        # of shards are not kept after they are yielded
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            range_iter = iter(range_list)
+            future_queue = deque()
+
+            while (True):
+                for start, end in islice(
+                    range_iter,
+                    2 * self.workers - len(future_queue)
+                ):
+                    future_queue.append(executor.submit(
+                        loadByteRange,
+                        self.file_path,
+                        start,
+                        end,
+                        self.file_format,
+                        self.encoding,
+                        self.users_used,
+                        function
+                        ))
+
+                if (not future_queue):
                     break
 
-                match = regex_object.match(line.rstrip('\n'))
-                if (match and
-                   int(match.group(1)) >= self.users_used and match.group(2)):
-                    password_list.append(match.group(2))
+                yield future_queue.popleft().result()
 
-        return password_list
+    @staticmethod
+    def getByteRanges(file_path, shards):
+        """Return list of (start, end) byte ranges of file,
+        every range except last ends after new line
+        """
+        size = os.path.getsize(file_path)
+        border_list = [0]
+
+        with open(file_path, 'rb') as input_file:
+            for i in range(1, shards):
+                position = max(size * i // shards, border_list[-1])
+                input_file.seek(position)
+
+                # Move to start of next line
+                if (position > 0):
+                    input_file.seek(position - 1)
+                    input_file.readline()
+                border_list.append(min(input_file.tell(), size))
+
+        border_list.append(size)
+
+        return [
+            (start, end) for start, end in zip(border_list, border_list[1:])
+            if (start < end)
+            ]
+
+
+def loadByteRange(
+    file_path, start, end, file_format, encoding, users_used, function=None
+        ):
+    """Parse passwords of one byte range of file, runs in process
+    of LoadSharded
+
+    Return value:
+    password_list or result of function(password_list)
+    """
+    with open(file_path, 'rb') as input_file:
+        input_file.seek(start)
+        block = input_file.read(end - start)
+
+    if (file_format == 'count'):
+        password_list = [
+            password
+            for count, password in parseLines(splitLines(block), users_used)
+            if (password)
+            ]
+    else:
+        password_list = [
+            line.rstrip('\n')
+            for line in io.TextIOWrapper(io.BytesIO(block), encoding=encoding)
+            ]
+
+    if (function):
+        return function(password_list)
+
+    return password_list
+
+
+class TransformAndCheckShard():
+
+    def __init__(self, transformation, pass_check_lib):
+        """Function for LoadSharded.mapShards, shard is transformed
+        and checked in process which loaded it
+
+        Results can be saved by Saver.saveStream
+
+        PassCheckLib is copied to every process, so with more workers
+        it can't have cache, journal, tuner or library with other than
+        subprocess backend (ctypes, pwquality, passfault server).
+        Such PassCheckLib is given as picklable function (e.g. function
+        of module) which creates it, every process creates its own.
+
+        Arguments:
+        transformation -- class rules.Transformation
+        pass_check_lib -- class libCheck.PassCheckLib or function
+                          without arguments returning it
+        """
+        self.transformation = transformation
+        self.pass_check_lib = pass_check_lib
+
+    def checkShareable(self):
+        """Exit with error if PassCheckLib can't be copied
+        to processes of LoadSharded
+        """
+        if (callable(self.pass_check_lib)):
+            return
+
+        pass_check_lib = self.pass_check_lib
+        name_list = [
+            name for name in ('cache', 'journal', 'tuner')
+            if (getattr(pass_check_lib, name, None))
+            ]
+        name_list += [
+            pcl.__class__.__name__ + ' (' + pcl.backend + ' backend)'
+            for pcl in pass_check_lib.single_pcl_list +
+            pass_check_lib.multi_pcl_list
+            if (pcl.backend != 'subprocess')
+            ]
+
+        if (name_list):
+            errorPrinter.printError(
+                self.__class__.__name__,
+                'PassCheckLib with ' + ', '.join(name_list) +
+                ' can\'t be copied to worker processes, pass function ' +
+                'creating PassCheckLib or use workers=1'
+                )
+
+    def __call__(self, password_list):
+        if (callable(self.pass_check_lib)):
+            self.pass_check_lib = self.pass_check_lib()
+
+        passinfo_list = self.transformation.apply(password_list)
+
+        return passinfo_list, self.pass_check_lib.check(passinfo_list)
 
 
 class LoadFromJson(Loader):
@@ -180,11 +440,23 @@ class LoadFromJson(Loader):
 
 class LoadFromCSV(Loader):
 
-    def __init__(self, file_path=None, from_row=None, to_row=None):
+    def __init__(
+        self, file_path=None, from_row=None, to_row=None, pcl_columns=None
+            ):
+        """
+        Arguments:
+        file_path -- path to csv file
+        from_row -- first loaded row, rows before it are skipped
+                    by index stored to file_path + '.idx'
+        to_row -- last loaded row
+        pcl_columns -- list of PCL names, which outputs are loaded
+                       from column files created by SavePCLColumnToCSV
+        """
         super(LoadFromCSV, self).__init__()
         self.file_path = file_path
         self.from_row = from_row
         self.to_row = to_row
+        self.pcl_columns = pcl_columns if (pcl_columns) else []
 
         if (from_row and from_row < 0):
             errorPrinter.printError(
@@ -226,6 +498,12 @@ class LoadFromCSV(Loader):
         pcl_data = {}
 
         row_counter = 0
+        if (self.from_row):
+            row_counter = CSVIndex(self.file_path).seek(
+                csv_file,
+                self.from_row
+                )
+
         for row in csv_reader:
             row_counter += 1
 
@@ -260,6 +538,270 @@ class LoadFromCSV(Loader):
 
             pcl_data.update({row[0]: pcl_output})
 
+        csv_file.close()
+
+        for pcl in self.pcl_columns:
+            self.loadPCLColumn(
+                SavePCLColumnToCSV(self.file_path, pcl).file_path,
+                pcl_data
+                )
+
+        return passinfo_list, pcl_data
+
+    @staticmethod
+    def loadPCLColumn(file_path, pcl_data):
+        """Add outputs of one PCL from column file to pcl_data
+        """
+        with open(file_path, 'r') as csv_file:
+            csv_reader = csv.reader(
+                csv_file,
+                delimiter=',',
+                quotechar='\"',
+                quoting=csv.QUOTE_MINIMAL
+            )
+            header = next(csv_reader)
+
+            for row in csv_reader:
+                if (row[0] in pcl_data):
+                    pcl_data[row[0]].update({
+                        header[1]: (
+                            row[1],
+                            float(row[2]) if (row[2]) else None
+                            )
+                        })
+
+
+class LoadPasswordsFromCSV(Loader):
+
+    def __init__(self, file_path=None):
+        super(LoadPasswordsFromCSV, self).__init__()
+        self.file_path = file_path
+
+    def load_data(self):
+        """Load unique passwords from csv file, without PCL outputs
+
+        Method return -- password_list of type list
+        """
+        password_dic = {}
+
+        with open(self.file_path, 'r') as csv_file:
+            csv_reader = csv.reader(
+                csv_file,
+                delimiter=',',
+                quotechar='\"',
+                quoting=csv.QUOTE_MINIMAL
+            )
+            next(csv_reader)
+
+            for row in csv_reader:
+                password_dic[row[0]] = None
+
+        return list(password_dic.keys())
+
+
+# File of SaveDataToColumns starts with magic and length of json header
+COLUMNS_MAGIC = b'PCLCOL1\n'
+
+# Code of None PCL output
+COLUMNS_NONE = 0xFFFFFFFF
+
+# Bits of PassInfo.char_classes in column 'char_classes'
+COLUMNS_CHAR_CLASSES = [
+    'lower letter', 'upper letter', 'number', 'special char'
+    ]
+
+
+class ColumnarFile():
+
+    def __init__(self, file_path):
+        """Memory mapped file of SaveDataToColumns, columns
+        are typed memoryviews of file, nothing is parsed on open
+
+        Arguments:
+        file_path -- path to file saved by SaveDataToColumns
+        """
+        self.file_path = file_path
+        self.input_file = open(file_path, 'rb')
+        self.data = mmap.mmap(
+            self.input_file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+        if (self.data[:len(COLUMNS_MAGIC)] != COLUMNS_MAGIC):
+            self.close()
+            errorPrinter.printError(
+                self.__class__.__name__,
+                'File \'' + file_path + '\' is not columnar result file'
+                )
+
+        position = len(COLUMNS_MAGIC)
+        header_size = struct.unpack_from('<Q', self.data, position)[0]
+        position += 8
+        self.header = json.loads(
+            self.data[position:position + header_size].decode('UTF-8')
+            )
+        self.data_start = position + header_size + \
+            (-(position + header_size) % 8)
+
+        if (self.header['byteorder'] != sys.byteorder):
+            self.close()
+            errorPrinter.printError(
+                self.__class__.__name__,
+                'File \'' + file_path + '\' has different byte order'
+                )
+
+        self.rows = self.header['rows']
+        self.pcl_list = self.header['pcl_list']
+        self.columns = {}
+
+    def __len__(self):
+        return self.rows
+
+    def getColumn(self, name):
+        """Return memoryview of column cast to its type
+        """
+        if (name not in self.columns):
+            offset, typecode, length = self.header['sections'][name]
+            start = self.data_start + offset
+            view = memoryview(self.data)[
+                start:start + length * array.array(typecode).itemsize
+                ]
+            self.columns.update({name: view.cast(typecode)})
+
+        return self.columns[name]
+
+    def getStringTable(self, name):
+        """Return list of strings of table
+        """
+        offsets = self.getColumn(name + '.offsets')
+        data = bytes(self.getColumn(name + '.data'))
+
+        return [
+            data[offsets[i]:offsets[i + 1]].decode('UTF-8')
+            for i in range(len(offsets) - 1)
+            ]
+
+    def close(self):
+        # Views must be released before mmap is closed
+        for column in self.columns.values():
+            column.release()
+        self.columns = {}
+
+        self.data.close()
+        self.input_file.close()
+
+
+class LoadFromColumns(Loader):
+
+    def __init__(self, file_path=None, from_row=None, to_row=None):
+        """Load file saved by SaveDataToColumns, same output
+        as LoadFromCSV
+
+        Arguments:
+        file_path -- path to columnar file
+        from_row -- first loaded row
+        to_row -- last loaded row
+        """
+        super(LoadFromColumns, self).__init__()
+        self.file_path = file_path
+        self.from_row = from_row
+        self.to_row = to_row
+
+    def load_data(self):
+        columns = ColumnarFile(self.file_path)
+
+        # Loaded objects have no reference cycles, garbage collector
+        # would only scan them again and again while they are created
+        gc_enabled = gc.isenabled()
+        gc.disable()
+
+        try:
+            return self.loadColumns(columns)
+        finally:
+            if (gc_enabled):
+                gc.enable()
+            columns.close()
+
+    def loadColumns(self, columns):
+        first = max(self.from_row - 1, 0) if (self.from_row) else 0
+        last = min(self.to_row, len(columns)) if (self.to_row) \
+            else len(columns)
+
+        password_offsets = columns.getColumn('password.offsets')
+        password_data = bytes(columns.getColumn('password.data'))
+        orig_column = columns.getColumn('orig')
+        diff_char_column = columns.getColumn('diff_char')
+        char_class_column = columns.getColumn('char_classes')
+        rule_offsets = columns.getColumn('rules.offsets')
+        rule_ids = columns.getColumn('rules.ids')
+        rule_values = columns.getColumn('rules.values')
+        rule_names = columns.getStringTable('rule_names')
+
+        # Lists of character classes of every bit mask
+        char_class_table = [
+            [
+                char_class
+                for bit, char_class in enumerate(COLUMNS_CHAR_CLASSES)
+                if (mask & (1 << bit))
+            ]
+            for mask in range(1 << len(COLUMNS_CHAR_CLASSES))
+            ]
+
+        def getPassInfo(row, orig_passinfo=None):
+            return PassInfo.fromStoredData(
+                password_data[
+                    password_offsets[row]:password_offsets[row + 1]
+                    ].decode('UTF-8'),
+                diff_char_column[row],
+                list(char_class_table[char_class_column[row]]),
+                orig_passinfo
+                )
+
+        pcl_column_list = []
+        for pcl in columns.pcl_list:
+            pcl_column_list.append((
+                pcl,
+                columns.getColumn('pcl.' + pcl + '.codes'),
+                columns.getColumn('pcl.' + pcl + '.scores'),
+                columns.getStringTable('pcl.' + pcl + '.table') + [None],
+                {}
+                ))
+
+        passinfo_list = []
+        pcl_data = {}
+        orig_passinfo_dic = {}
+
+        for row in range(first, last):
+            orig_row = orig_column[row]
+
+            if (orig_row < 0):
+                passinfo = getPassInfo(row)
+                orig_passinfo_dic = {row: passinfo}
+            else:
+                # Original row can be out of loaded rows
+                if (orig_row not in orig_passinfo_dic):
+                    orig_passinfo_dic = {orig_row: getPassInfo(orig_row)}
+                passinfo = getPassInfo(row, orig_passinfo_dic[orig_row])
+                passinfo.transform_rules = [
+                    {rule_names[rule_ids[i]]: rule_values[i]}
+                    for i in range(rule_offsets[row], rule_offsets[row + 1])
+                    ]
+
+            passinfo_list.append(passinfo)
+            password = passinfo.password
+
+            pcl_output = {}
+            for pcl, codes, scores, table, output_cache in pcl_column_list:
+                # Same outputs share one tuple
+                key = (codes[row], scores[row])
+                if (key not in output_cache):
+                    output_cache.update({key: (
+                        table[-1 if (key[0] == COLUMNS_NONE) else key[0]],
+                        None if (math.isnan(key[1])) else key[1]
+                        )})
+                pcl_output.update({pcl: output_cache[key]})
+
+            pcl_data.update({password: pcl_output})
+
         return passinfo_list, pcl_data
 
 
@@ -290,10 +832,36 @@ class Saver():
 
         print("Saving DONE\n")
 
+    def saveStream(self, chunk_iter):
+        """Save chunks of checked passwords, only one chunk
+        is in memory
+
+        Arguments:
+        chunk_iter -- iterable of (passinfo_list, pcl_data) tuples,
+                      e.g. PassCheckLib.checkStream
+        """
+        print("Saving data stream... using " + self.__class__.__name__)
+
+        try:
+            self.save_stream(chunk_iter)
+        except IOError:
+            errorPrinter.printError(
+                self.__class__.__name__,
+                'File \'{0:1}\' doesn\'t exist'.format(self.file_path)
+                )
+
+        print("Saving DONE\n")
+
     @abstractmethod
     def save_data(self, passinfo_list, pcl_data):
         pass
 
+    def save_stream(self, chunk_iter):
+        errorPrinter.printError(
+            self.__class__.__name__,
+            'Streaming is not supported'
+            )
+
 
 class SaveDataToJson(Saver):
 
@@ -348,8 +916,9 @@ class SaveDataToCSV(Saver):
         )
 
     def save_data(self, passinfo_list, pcl_data):
-        pcl_list = sorted(pcl_data[passinfo_list[0].password].keys())
+        self.save_stream([(passinfo_list, pcl_data)])
 
+    def save_stream(self, chunk_iter):
         csv_file = open(self.file_path, 'w')
         csv_writer = csv.writer(
             csv_file,
@@ -358,13 +927,27 @@ class SaveDataToCSV(Saver):
             quoting=csv.QUOTE_MINIMAL
             )
 
-        # Print header to file
-        header = ['password', 'transform_rules']
-        for pcl in pcl_list:
-            header += [pcl, pcl + ' - score']
+        pcl_list = None
+        for passinfo_list, pcl_data in chunk_iter:
+            if (not passinfo_list):
+                continue
+
+            if (pcl_list is None):
+                pcl_list = sorted(pcl_data[passinfo_list[0].password].keys())
+
+                # Print header to file
+                header = ['password', 'transform_rules']
+                for pcl in pcl_list:
+                    header += [pcl, pcl + ' - score']
 
-        csv_writer.writerow(header)
+                csv_writer.writerow(header)
+
+            self.writeRows(csv_writer, pcl_list, passinfo_list, pcl_data)
+
+        csv_file.close()
 
+    @staticmethod
+    def writeRows(csv_writer, pcl_list, passinfo_list, pcl_data):
         # Print data to csv_file
         for passinfo in passinfo_list:
             row = [
@@ -380,8 +963,6 @@ class SaveDataToCSV(Saver):
 
             csv_writer.writerow(row)
 
-        csv_file.close()
-
 
 class AppendDataToCSV(Saver):
 
@@ -490,3 +1071,193 @@ class AppendDataToCSV(Saver):
 
         csv_file_old.close()
         csv_file_new.close()
+
+
+class SavePCLColumnToCSV(Saver):
+
+    def __init__(self, file_path, pcl_name):
+        """Save outputs of one PCL next to existing csv file,
+        to 'file_path' without extension + '.' + pcl_name + '.csv'
+
+        Arguments:
+        file_path -- path to existing csv file
+        pcl_name -- name of PCL, which outputs are saved
+        """
+        if (file_path[-len('.csv'):] == '.csv'):
+            file_path = file_path[:-len('.csv')]
+
+        super(SavePCLColumnToCSV, self).__init__(
+            file_path + '.' + pcl_name,
+            '.csv'
+        )
+        self.pcl_name = pcl_name
+
+    def save_data(self, passinfo_list, pcl_data):
+        """Store PCL outputs of every password from pcl_data,
+        passinfo_list is not used, only unique passwords are stored
+        """
+        with open(self.file_path, 'w') as csv_file:
+            csv_writer = csv.writer(
+                csv_file,
+                delimiter=',',
+                quotechar='\"',
+                quoting=csv.QUOTE_MINIMAL
+                )
+
+            csv_writer.writerow([
+                'password', self.pcl_name, self.pcl_name + ' - score'
+                ])
+
+            for password, pcl_output in pcl_data.items():
+                if (self.pcl_name in pcl_output):
+                    csv_writer.writerow([
+                        password,
+                        pcl_output[self.pcl_name][0],
+                        pcl_output[self.pcl_name][1]
+                        ])
+
+
+class SaveDataToColumns(Saver):
+
+    def __init__(self, file_path=None):
+        """Save passwords and PCL outputs to binary columnar file,
+        file is loaded by LoadFromColumns
+
+        Every column is typed array aligned to 8 bytes: passwords
+        and string tables as offsets and UTF-8 data, transformation
+        rules as ids of rule names and values, PCL outputs as codes
+        of output string table and scores with NaN for None
+
+        Transformed row stores row of its original, original which
+        is not in saved list is stored after last row without
+        PCL outputs and it isn't loaded as row
+        """
+        super(SaveDataToColumns, self).__init__(
+            file_path,
+            '.pclc'
+        )
+
+    def save_data(self, passinfo_list, pcl_data):
+        pcl_list = sorted(pcl_data[passinfo_list[0].password].keys()) \
+            if (passinfo_list) else []
+
+        section_list = []
+
+        def addStrings(name, string_list):
+            offsets = array.array('Q', [0])
+            data = bytearray()
+            for string in string_list:
+                data += string.encode('UTF-8')
+                offsets.append(len(data))
+
+            section_list.append((name + '.offsets', offsets))
+            section_list.append((name + '.data', array.array('B', data)))
+
+        # Transformed row stores row of its original PassInfo,
+        # original missing in passinfo_list is stored after last row
+        row_list = list(passinfo_list)
+        orig_row_dic = {
+            id(passinfo): row
+            for row, passinfo in enumerate(passinfo_list)
+            if (not getattr(passinfo, 'transform_rules', None))
+            }
+
+        orig_column = array.array('q')
+        rule_offsets = array.array('Q', [0])
+        rule_ids = array.array('I')
+        rule_values = array.array('d')
+        rule_name_dic = {}
+
+        for passinfo in passinfo_list:
+            transform_rules = getattr(passinfo, 'transform_rules', None)
+            if (transform_rules):
+                orig_pass = passinfo.orig_pass
+                if (id(orig_pass) not in orig_row_dic):
+                    orig_row_dic.update({id(orig_pass): len(row_list)})
+                    row_list.append(orig_pass)
+
+                orig_column.append(orig_row_dic[id(orig_pass)])
+                for rule in transform_rules:
+                    name, value = list(rule.items())[0]
+                    rule_ids.append(
+                        rule_name_dic.setdefault(name, len(rule_name_dic))
+                        )
+                    rule_values.append(value)
+            else:
+                orig_column.append(-1)
+            rule_offsets.append(len(rule_ids))
+
+        for passinfo in row_list[len(passinfo_list):]:
+            orig_column.append(-1)
+            rule_offsets.append(len(rule_ids))
+
+        addStrings(
+            'password',
+            [passinfo.password for passinfo in row_list]
+            )
+        section_list += [
+            ('diff_char', array.array(
+                'I',
+                [passinfo.diff_char for passinfo in row_list]
+                )),
+            ('char_classes', array.array('B', [
+                sum(
+                    1 << bit
+                    for bit, char_class in enumerate(COLUMNS_CHAR_CLASSES)
+                    if (char_class in passinfo.char_classes)
+                    )
+                for passinfo in row_list
+                ])),
+            ('orig', orig_column),
+            ('rules.offsets', rule_offsets),
+            ('rules.ids', rule_ids),
+            ('rules.values', rule_values)
+            ]
+        addStrings('rule_names', list(rule_name_dic.keys()))
+
+        for pcl in pcl_list:
+            codes = array.array('I')
+            scores = array.array('d')
+            output_dic = {}
+
+            for passinfo in passinfo_list:
+                output, score = pcl_data[passinfo.password][pcl]
+                codes.append(
+                    COLUMNS_NONE if (output is None)
+                    else output_dic.setdefault(output, len(output_dic))
+                    )
+                scores.append(float('nan') if (score is None) else score)
+
+            section_list += [
+                ('pcl.' + pcl + '.codes', codes),
+                ('pcl.' + pcl + '.scores', scores)
+                ]
+            addStrings('pcl.' + pcl + '.table', list(output_dic.keys()))
+
+        self.writeSections(len(passinfo_list), pcl_list, section_list)
+
+    def writeSections(self, rows, pcl_list, section_list):
+        sections = {}
+        offset = 0
+        for name, column in section_list:
+            sections.update({name: [offset, column.typecode, len(column)]})
+            size = len(column) * column.itemsize
+            offset += size + (-size % 8)
+
+        header = json.dumps({
+            'rows': rows,
+            'pcl_list': pcl_list,
+            'byteorder': sys.byteorder,
+            'sections': sections
+            }).encode('UTF-8')
+
+        with open(self.file_path, 'wb') as output_file:
+            output_file.write(COLUMNS_MAGIC)
+            output_file.write(struct.pack('<Q', len(header)))
+            output_file.write(header)
+            output_file.write(b'\0' * (-output_file.tell() % 8))
+
+            for name, column in section_list:
+                column.tofile(output_file)
+                size = len(column) * column.itemsize
+                output_file.write(b'\0' * (-size % 8))
@@ -1,5 +1,6 @@
 from abc import ABCMeta, abstractmethod
 from prettytable import PrettyTable
+from scripts.countParser import iterateCountPrefixed
 
 import scripts.errorPrinter as errorPrinter
 import math
@@ -541,18 +542,15 @@ class AddNumberOfUsesToPassData(FilterTemplate):
         )
 
     def apply(self, data):
-        regex_object = re.compile(r" *(\d+) (.*)")
+        count_iter = iterateCountPrefixed(self.variable)
 
-        with open(self.variable, 'r', encoding='latin1') as inputfile:
-            for passdata in data:
-                for line in inputfile:
-                    nous, password = regex_object.match(line.rstrip('\n')).groups()
-
-                    if (password == passdata.password):
-                        passdata.addAttribute({
-                            'numberOfUses': int(nous)
-                        })
-                        break
+        for passdata in data:
+            for nous, password in count_iter:
+                if (password == passdata.password):
+                    passdata.addAttribute({
+                        'numberOfUses': nous
+                    })
+                    break
 
         return data
 
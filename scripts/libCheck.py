@@ -1,21 +1,64 @@
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from itertools import islice, repeat
+from scripts.pclStats import PCLStats, ChunkStats
 from zxcvbn import zxcvbn
 
 import scripts.errorPrinter as errorPrinter
 import subprocess
+import threading
+import hashlib
+import ctypes
+import ctypes.util
+import queue
+import time
+import json
+import io
+import os
 
 
 class PassCheckLib():
 
-    def __init__(self):
+    def __init__(
+        self, parallel=False, max_parallel=None, cache=None, journal=None,
+        tuner=None, report_path=None
+            ):
         """Initialize list of password checking libraries
+
+        Arguments:
+        parallel -- boolean, if true run all libraries at the same time
+        max_parallel -- int, maximum number of libraries running at once,
+                        None means no limit
+        cache -- class pclCache.PCLCache, only passwords missing
+                 in cache are checked by libraries
+        journal -- class checkJournal.CheckJournal, outputs are written
+                   to journal after every checkpoint and passwords
+                   finished in interrupted run are not checked again
+        tuner -- class adaptiveTuner.AdaptiveTuner, tunes chunk size and
+                 number of workers of every library during check
+        report_path -- path to json file, where report with throughput
+                       and time of every library is written after check
         """
         self.single_pcl_list = []
         self.multi_pcl_list = []
+        self.parallel = parallel
+        self.max_parallel = max_parallel
+        self.cache = cache
+        self.journal = journal
+        self.tuner = tuner
+        self.report_path = report_path
+        self.report = None
 
-    def add(self, pcl):
+    def add(self, pcl, workers=None):
         """Add password checking library to list
-        """ 
+
+        Arguments:
+        pcl -- class Library
+        workers -- int, optional concurrency limit of this library
+        """
+        if (workers):
+            pcl.workers = workers
+
         if (pcl.single_pass):
             self.single_pcl_list.append(pcl)
         else:
@@ -31,41 +74,334 @@ class PassCheckLib():
         Return value:
         pcl_dic -- dictionary, key=string value=dictionary
         """
-        print("Checking passwords...")
+        password_list = [passinfo.password for passinfo in passinfo_list]
 
-        pcl_dic = {}
-        for pcl in self.single_pcl_list:
-            print("PCL: " + pcl.__class__.__name__)
-            for passinfo in passinfo_list:
-                if (passinfo.password not in pcl_dic):
-                    pcl_dic.update({passinfo.password: {}})
+        return self.checkPasswordList(
+            password_list,
+            CheckPlan(
+                password_list,
+                [hasattr(passinfo, 'orig_pass') for passinfo in passinfo_list]
+                )
+            )
 
-                pcl.checkPassword(passinfo.password, pcl_dic)
+    def checkStream(self, passinfo_iter, chunk_size=100000):
+        """Check passwords from iterable in chunks, only one chunk
+        is in memory, duplicates are removed inside every chunk
 
-        # Check passwords with multi_pcl_list
-        for pcl in self.multi_pcl_list:
-            print("PCL: " + pcl.__class__.__name__)
-            pcl.checkPassword(
-                [passinfo.password for passinfo in passinfo_list],
-                pcl_dic
-                )
+        Arguments:
+        passinfo_iter -- iterable of PassInfo classes,
+                         e.g. rules.Transformation.iterate
+        chunk_size -- int, number of PassInfo classes in one chunk
+
+        Return value:
+        generator of (passinfo_list, pcl_dic) tuples
+        """
+        passinfo_iter = iter(passinfo_iter)
+
+        while (True):
+            passinfo_list = list(islice(passinfo_iter, chunk_size))
+            if (not passinfo_list):
+                break
 
-        print("Checking passwords DONE\n")
+            yield passinfo_list, self.check(passinfo_list)
+
+    def checkPasswordList(self, password_list, plan=None, verbose=True):
+        """Check every password from list of strings with every
+        password checking library from list
+
+        Arguments:
+        password_list -- list of passwords
+        plan -- class CheckPlan of password_list, created if None
+        verbose -- boolean, if false progress, dedup, cache, journal
+                   and throughput are not printed
+
+        Return value:
+        pcl_dic -- dictionary, key=string value=dictionary
+        """
+        if (verbose):
+            print("Checking passwords...")
+
+        pcl_list = self.single_pcl_list + self.multi_pcl_list
+        plan = plan if (plan) else CheckPlan(password_list)
+        if (verbose):
+            plan.printReport(len(pcl_list))
+        self.report = {
+            'libraries': {},
+            'dedup': plan.getReport(len(pcl_list))
+            }
+        start = time.perf_counter()
+
+        # Every password is checked once, PassInfo classes
+        # with same password share its output
+        password_list = plan.password_list
+        pcl_dic = {password: {} for password in password_list}
+
+        # Cache statistics are printed for this check only
+        if (self.cache):
+            self.cache.resetStats()
+
+        if (self.parallel and len(pcl_list) > 1):
+            # Every library stores outputs to its own dictionary,
+            # dictionaries are merged in this thread
+            with ThreadPoolExecutor(
+                max_workers=self.max_parallel or len(pcl_list)
+            ) as executor:
+                future_list = [
+                    executor.submit(
+                        self.checkWithPCL,
+                        pcl,
+                        password_list,
+                        verbose
+                        )
+                    for pcl in pcl_list
+                    ]
+                for future in future_list:
+                    self.mergePCLOutput(pcl_dic, future.result())
+        else:
+            for pcl in pcl_list:
+                self.mergePCLOutput(
+                    pcl_dic,
+                    self.checkWithPCL(pcl, password_list, verbose)
+                    )
+
+        if (self.cache and verbose):
+            self.cache.printStats()
+
+        self.report.update({
+            'passwords': len(pcl_dic),
+            'wall_time': time.perf_counter() - start
+            })
+        self.printReport(verbose)
+
+        if (verbose):
+            print("Checking passwords DONE\n")
 
         return pcl_dic
 
+    def checkWithPCL(self, pcl, password_list, verbose=True):
+        """Check passwords with one library
+
+        Arguments:
+        pcl -- class Library
+        password_list -- list of unique passwords
+        verbose -- boolean, if false nothing is printed
+
+        Return value:
+        pcl_dic -- dictionary with outputs of this library only
+        """
+        pcl_name = pcl.__class__.__name__
+        if (verbose):
+            print("PCL: " + pcl_name)
+
+        pcl_dic = {password: {} for password in password_list}
+
+        pcl.stats = PCLStats()
+        start = time.perf_counter()
+
+        if (not self.cache and not self.journal):
+            self.runPCL(pcl, password_list, pcl_dic)
+        else:
+            self.checkMissing(pcl, pcl_dic, verbose)
+
+        self.report['libraries'].update({
+            pcl_name: pcl.stats.getReport(
+                len(pcl_dic),
+                time.perf_counter() - start
+                )
+            })
+
+        return pcl_dic
+
+    def checkMissing(self, pcl, pcl_dic, verbose=True):
+        """Check passwords missing in journal and cache with library,
+        store outputs to cache and journal
+
+        Arguments:
+        pcl -- class Library
+        pcl_dic -- dictionary with every password as key
+        verbose -- boolean, if false hits are not printed
+        """
+        pcl_name = pcl.__class__.__name__
+
+        # Outputs finished in interrupted run or stored in cache
+        known_output = {}
+        journal_hits = 0
+        if (self.journal):
+            known_output.update(self.journal.get(pcl, pcl_dic))
+            journal_hits = len(known_output)
+        if (self.cache):
+            known_output.update(self.cache.get(pcl, [
+                password for password in pcl_dic
+                if (password not in known_output)
+                ]))
+
+        missing_list = [
+            password for password in pcl_dic
+            if (password not in known_output)
+            ]
+
+        # Store outputs after every checkpoint
+        batch_size = self.journal.checkpoint if (self.journal) \
+            else len(missing_list)
+        for i in range(0, len(missing_list), max(batch_size, 1)):
+            batch = missing_list[i:i + batch_size]
+            self.runPCL(pcl, batch, pcl_dic)
+
+            batch_output = {
+                password: pcl_dic[password][pcl_name]
+                for password in batch
+                if (pcl_name in pcl_dic[password])
+                }
+            if (self.cache):
+                self.cache.store(pcl, batch_output)
+            if (self.journal):
+                self.journal.store(pcl, batch_output)
+
+        for password, output in known_output.items():
+            pcl_dic[password].update({pcl_name: output})
+
+        if (self.journal and verbose):
+            print(
+                "Journal: " + str(journal_hits) + " passwords skipped, " +
+                str(len(pcl_dic) - journal_hits) + " not in journal"
+                )
+        if (self.cache and verbose):
+            self.cache.printStats(pcl_name)
+
+    def runPCL(self, pcl, password_list, pcl_dic):
+        if (self.tuner):
+            self.tuner.checkPasswordList(pcl, password_list, pcl_dic)
+        else:
+            pcl.checkPasswordList(password_list, pcl_dic)
+
+    def printReport(self, verbose=True):
+        """Print throughput of every library,
+        whole report is written to report_path
+        """
+        for pcl_name, pcl_report in self.report['libraries'].items():
+            if (verbose and pcl_report['passwords_per_second'] is not None):
+                print(
+                    "PCL: " + pcl_name +
+                    " - {0:.1f} passwords/s".format(
+                        pcl_report['passwords_per_second']
+                        )
+                    )
+
+        if (self.report_path):
+            with open(self.report_path, 'w') as json_file:
+                json.dump(self.report, json_file, sort_keys=True, indent=4)
+
+    @staticmethod
+    def mergePCLOutput(pcl_dic, pcl_output_dic):
+        for password, pcl_output in pcl_output_dic.items():
+            if (password not in pcl_dic):
+                pcl_dic.update({password: {}})
+
+            pcl_dic[password].update(pcl_output)
+
+
+class CheckPlan():
+
+    def __init__(self, password_list, transformed_list=None):
+        """Unique passwords of check, every password is sent
+        to every library once
+
+        Arguments:
+        password_list -- list of passwords, can contain duplicates
+        transformed_list -- list of booleans, true if password
+                            on the same index is transformed
+        """
+        self.entries = len(password_list)
+        self.transformed = 0
+        self.transformed_duplicates = 0
+
+        password_dic = {}
+        for password, transformed in zip(
+            password_list,
+            transformed_list if (transformed_list) else repeat(False)
+        ):
+            if (transformed):
+                self.transformed += 1
+
+            if (password not in password_dic):
+                password_dic.update({password: None})
+            elif (transformed):
+                self.transformed_duplicates += 1
+
+        self.password_list = list(password_dic.keys())
+
+    def getReport(self, pcl_count):
+        """Return dictionary with work saved by dedup
+
+        Arguments:
+        pcl_count -- int, number of libraries
+        """
+        duplicates = self.entries - len(self.password_list)
+
+        return {
+            'entries': self.entries,
+            'unique': len(self.password_list),
+            'duplicates': duplicates,
+            'transformed': self.transformed,
+            'transformed_duplicates': self.transformed_duplicates,
+            'saved_checks': duplicates * pcl_count
+        }
+
+    def printReport(self, pcl_count):
+        report = self.getReport(pcl_count)
+        print(
+            "Dedup: " + str(report['unique']) + " unique of " +
+            str(report['entries']) + " passwords, " +
+            str(report['saved_checks']) + " library checks saved"
+            )
+
+        if (self.transformed):
+            print(
+                "Dedup: " + str(self.transformed_duplicates) + " of " +
+                str(self.transformed) + " transformed passwords " +
+                "are duplicates"
+                )
+
 
 class Library():
 
     __metaclass__ = ABCMeta
 
+    # True if library doesn't run in subprocess
+    in_process = False
+
+    # Library with other backend doesn't start args for every check
+    backend = 'subprocess'
+
+    # True if single pass library checks chunks of chunk_size
+    # by its own pool of processes
+    pool_chunks = False
+
     def __init__(
         self, single_pass=True,
-        delimiter=None, delimiter_index=None, *args
+        delimiter=None, delimiter_index=None, *args,
+        workers=1, stream=False, chunk_size=1000, version=None
             ):
+        """
+        Arguments:
+        single_pass -- boolean, if true check one password with one subprocess
+        delimiter -- optional argument, if is necessary to split library output
+        delimiter_index -- index of output part after split by delimiter
+        *args -- arguments for run/call library
+        workers -- int, number of checks running at once
+        stream -- boolean, if true multi pass library gets passwords
+                  in chunks and output is parsed line by line
+        chunk_size -- int, number of passwords written to library at once
+        version -- string, version of library, part of cache fingerprint
+        """
         self.single_pass = single_pass
         self.delimiter = (delimiter, delimiter_index)
         self.args = args
+        self.workers = workers
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.version = version
+        self.stats = PCLStats()
 
     @abstractmethod
     def checkPassword(self, password_input, pcl_dic):
@@ -79,15 +415,7 @@ class Library():
         *args -- arguments for run/call library
         """
         try:
-            output = self.getPCLOutput(
-                password_input,
-                self.single_pass,
-                self.delimiter,
-                self.args
-                )
-            output = self.convertOutput(
-                output
-            )
+            output = self.getOutput(password_input)
             self.storePCLOutput(
                 pcl_dic,
                 password_input,
@@ -101,7 +429,131 @@ class Library():
                 err
                 )
 
+    def checkPasswordList(self, password_list, pcl_dic):
+        """Check list of passwords and save outputs to pcl_dic
+
+        Single pass library keeps up to self.workers checks in flight,
+        multi pass library in subprocess runs self.workers processes,
+        each with chunk of self.chunk_size passwords.
+        Outputs are stored in the same order as password_list
+
+        Arguments:
+        password_list -- list of passwords
+        pcl_dic -- dictionary
+        """
+        if (not self.single_pass):
+            if (self.workers <= 1 or self.in_process or
+               len(password_list) <= self.chunk_size):
+                self.checkPassword(password_list, pcl_dic)
+                return
+
+            chunk_list = [
+                password_list[i:i + self.chunk_size]
+                for i in range(0, len(password_list), self.chunk_size)
+                ]
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for chunk, output in zip(
+                    chunk_list,
+                    executor.map(self.getOutput, chunk_list)
+                ):
+                    self.storePCLOutput(pcl_dic, chunk, output)
+            return
+
+        if (self.workers <= 1):
+            for password in password_list:
+                self.storePCLOutput(
+                    pcl_dic,
+                    password,
+                    self.getTimedOutput(password)
+                    )
+            return
+
+        # Library runs in subprocess, so threads are enough
+        # to keep several checks running on different cores
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            output_list = executor.map(self.getTimedOutput, password_list)
+            for password, output in zip(password_list, output_list):
+                self.storePCLOutput(pcl_dic, password, output)
+
+    def getTimedOutput(self, password):
+        """Return output of library for one password
+        and store time of check to stats
+        """
+        start = time.perf_counter()
+        output = self.getOutput(password)
+        self.stats.addPasswordTime(password, time.perf_counter() - start)
+
+        return output
+
+    def getOutput(self, password_input):
+        """Return converted output of library for password(s)
+
+        Arguments:
+        password_input -- string or list, password(s)
+        """
+        if (self.stream and not self.single_pass):
+            output = self.getPCLOutputStream(
+                password_input,
+                self.delimiter,
+                self.args,
+                self.chunk_size,
+                self.stats
+                )
+        else:
+            output = self.getPCLOutput(
+                password_input,
+                self.single_pass,
+                self.delimiter,
+                self.args,
+                self.stats
+                )
+
+        with self.stats.measure('convert'):
+            return self.convertOutput(
+                output
+            )
+
+    def getFingerprint(self):
+        """Return fingerprint of library configuration
+
+        Options that don't change output (workers, stream, ...)
+        are not part of fingerprint
+        """
+        return hashlib.sha1(bytes(
+            repr((
+                self.__class__.__name__,
+                self.args,
+                self.delimiter,
+                self.version
+                ) + self.getFingerprintOptions()),
+            'UTF-8'
+            )).hexdigest()
+
+    def getFingerprintOptions(self):
+        """Return tuple of options of library, which change its output,
+        subclass with such options extends it
+        """
+        return ()
+
+    def checkBackend(self, backend, allowed):
+        """Print error and exit if backend isn't supported by library
+
+        Arguments:
+        backend -- string, backend given to constructor
+        allowed -- tuple of strings, backends of library
+        """
+        if (backend not in allowed):
+            errorPrinter.printError(
+                self.__class__.__name__,
+                'Unknown backend \'' + str(backend) + '\', expected ' +
+                ', '.join(allowed)
+                )
+
     def storePCLOutput(self, pcl_dic, password_input, pcl_output):
+        with self.stats.measure('store'):
+            self.storeOutput(pcl_dic, password_input, pcl_output)
+
+    def storeOutput(self, pcl_dic, password_input, pcl_output):
         if (type(password_input) is list):
             for password, output in zip(password_input, pcl_output):
                 if (password not in pcl_dic):
@@ -120,7 +572,22 @@ class Library():
         return input_output
 
     @staticmethod
-    def getPCLOutput(password_input, single_pass, delimiter, args):
+    def resolveOutput(password_data, delimiter):
+        """Split output of library for one password by delimiter
+        """
+        password_data = password_data.rstrip('\n')
+        if (delimiter[0]):
+            output_split = password_data.split(delimiter[0])
+
+            return (output_split[0], None) if (len(output_split) == 1) \
+                else (output_split[delimiter[1]], None)
+
+        return (password_data, None)
+
+    @staticmethod
+    def getPCLOutput(
+        password_input, single_pass, delimiter, args, stats=None
+            ):
         """Function get output of library and store it to passwordData
 
         Arguments:
@@ -128,100 +595,536 @@ class Library():
         single_pass -- boolean, if true check one password with one subprocess
         delimiter -- split library output
         args -- arguments for run/call library
+        stats -- class PCLStats, time of phases is added to it
         """
-        def resolveOutput(password_data, delimiter):
-            password_data = password_data.rstrip('\n')
-            if (delimiter[0]):
-                output_split = password_data.split(delimiter[0])
+        resolveOutput = Library.resolveOutput
+        stats = stats if (stats) else PCLStats()
 
-                return (output_split[0], None) if (len(output_split) == 1) \
-                    else (output_split[delimiter[1]], None)
+        with stats.measure('spawn'):
+            p = subprocess.Popen(
+                args,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT
+                )
 
-            return (password_data, None)
+        with stats.measure('io'):
+            output = p.communicate(input=bytes(
+                password_input if (single_pass)
+                else '\n'.join(password_input),
+                'UTF-8'
+                ))
 
-        p = subprocess.Popen(
-            args,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT
-            )
+        with stats.measure('parse'):
+            output = output[0].decode('UTF-8')
 
-        output = p.communicate(input=bytes(
-            password_input if (single_pass) else '\n'.join(password_input),
-            'UTF-8'
-            ))
-        output = output[0].decode('UTF-8')
+            if (single_pass):
+                return resolveOutput(output, delimiter)
+
+            # Resolve all passwords from output & return list
+            password_list = []
+            output_list = output.split('\n')
+
+            for password_output in output_list:
+                password_list.append(resolveOutput(
+                    password_output,
+                    delimiter
+                ))
 
-        if (single_pass):
-            return resolveOutput(output, delimiter)
+            return password_list
+
+    @staticmethod
+    def getPCLOutputStream(
+        password_input, delimiter, args, chunk_size, stats=None
+            ):
+        """Function get output of multi pass library without
+        creating whole input and output in memory
+
+        Passwords are written to library in chunks, output is read
+        and resolved line by line in reader thread
+
+        Arguments:
+        password_input -- list or iterable of passwords
+        delimiter -- split library output
+        args -- arguments for run/call library
+        chunk_size -- int, number of passwords written at once
+        stats -- class PCLStats, time of phases is added to it
+        """
+        stats = stats if (stats) else PCLStats()
+
+        with stats.measure('spawn'):
+            p = subprocess.Popen(
+                args,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT
+                )
 
-        # Resolve all passwords from output & return list
         password_list = []
-        output_list = output.split('\n')
+        start = time.perf_counter()
+        parse_time = [0.0]
+        reader_error = []
 
-        for password_output in output_list:
-            password_list.append(resolveOutput(
-                password_output,
-                delimiter
-            ))
+        def readOutput():
+            try:
+                for password_output in io.TextIOWrapper(
+                    p.stdout,
+                    encoding='UTF-8'
+                ):
+                    parse_start = time.perf_counter()
+                    password_list.append(Library.resolveOutput(
+                        password_output,
+                        delimiter
+                    ))
+                    parse_time[0] += time.perf_counter() - parse_start
+            except Exception as err:
+                # Outputs after error would be paired with wrong passwords
+                reader_error.append(err)
+                p.kill()
+
+        reader = threading.Thread(target=readOutput)
+        reader.start()
+
+        try:
+            password_iter = iter(password_input)
+            while (True):
+                chunk = list(islice(password_iter, chunk_size))
+                if (not chunk):
+                    break
+
+                p.stdin.write(bytes('\n'.join(chunk) + '\n', 'UTF-8'))
+            p.stdin.close()
+        except BrokenPipeError:
+            if (not reader_error):
+                errorPrinter.printWarning(
+                    'Library',
+                    'Library ' + str(args[0]) + ' closed its input'
+                    )
+        except Exception:
+            p.kill()
+            raise
+        finally:
+            # Reader ends only after library gets end of its input
+            try:
+                p.stdin.close()
+            except OSError:
+                pass
+            reader.join()
+            p.wait()
+
+        if (reader_error):
+            raise reader_error[0]
+
+        # Parsing runs while library works, rest of time is io
+        stats.addPhase('parse', parse_time[0])
+        stats.addPhase('io', time.perf_counter() - start - parse_time[0])
 
         return password_list
 
 
 class CrackLib(Library):
 
-    def __init__(self):
+    def __init__(self, backend='subprocess', dictionary=None, **options):
+        """
+        Arguments:
+        backend -- 'subprocess' pipes passwords through cracklib-check,
+                   'ctypes' calls libcrack in this process
+        dictionary -- path to cracklib dictionary used by 'ctypes' backend,
+                      None means default dictionary of libcrack
+        """
         super(CrackLib, self).__init__(
             False,
             ": ",
             1,
-            "cracklib-check"
+            "cracklib-check",
+            **options
         )
+        self.backend = backend
+        self.dictionary = dictionary
+        self.checkBackend(backend, ('subprocess', 'ctypes'))
+
+        if (backend == 'ctypes'):
+            self.loadLibCrack(dictionary)
+
+    def loadLibCrack(self, dictionary):
+        """Load libcrack and open cracklib dictionary once
+        """
+        library_path = ctypes.util.find_library('crack')
+        if (not library_path):
+            errorPrinter.printError(
+                self.__class__.__name__,
+                'Shared library libcrack was not found'
+                )
+
+        self.libcrack = ctypes.CDLL(library_path)
+        self.libcrack_lock = threading.Lock()
+        self.in_process = True
+
+        if (not dictionary):
+            if (hasattr(self.libcrack, 'GetDefaultCracklibDict')):
+                self.libcrack.GetDefaultCracklibDict.restype = ctypes.c_char_p
+                dictionary = self.libcrack.GetDefaultCracklibDict().decode(
+                    'UTF-8'
+                    )
+            else:
+                dictionary = '/usr/share/cracklib/pw_dict'
+        self.dictionary_path = bytes(dictionary, 'UTF-8')
+
+        # FascistCheck opens dictionary on every call, so open it here
+        # and use FascistLook if libcrack exports it
+        self.pwdict = None
+        if (hasattr(self.libcrack, 'PWOpen') and
+           hasattr(self.libcrack, 'FascistLook')):
+            self.libcrack.PWOpen.argtypes = [ctypes.c_char_p, ctypes.c_char_p]
+            self.libcrack.PWOpen.restype = ctypes.c_void_p
+            self.libcrack.FascistLook.argtypes = [
+                ctypes.c_void_p, ctypes.c_char_p
+                ]
+            self.libcrack.FascistLook.restype = ctypes.c_char_p
+            self.pwdict = self.libcrack.PWOpen(self.dictionary_path, b'r')
+
+        if (not self.pwdict):
+            self.libcrack.FascistCheck.argtypes = [
+                ctypes.c_char_p, ctypes.c_char_p
+                ]
+            self.libcrack.FascistCheck.restype = ctypes.c_char_p
+
+    def getFingerprintOptions(self):
+        return (self.dictionary, )
+
+    def getOutput(self, password_input):
+        if (self.backend != 'ctypes'):
+            return super(CrackLib, self).getOutput(password_input)
+
+        with self.stats.measure('check'):
+            if (type(password_input) is list):
+                return [
+                    self.fascistCheck(password) for password in password_input
+                    ]
+
+            return self.fascistCheck(password_input)
+
+    def fascistCheck(self, password):
+        """Return (message, None) like cracklib-check,
+        message is 'OK' if password passed
+        """
+        password = bytes(password, 'UTF-8')
+
+        # libcrack uses static buffers, one check at a time
+        with self.libcrack_lock:
+            if (self.pwdict):
+                message = self.libcrack.FascistLook(self.pwdict, password)
+            else:
+                message = self.libcrack.FascistCheck(
+                    password,
+                    self.dictionary_path
+                    )
+
+        return (message.decode('UTF-8') if (message) else 'OK', None)
 
 
 class PassWDQC(Library):
 
-    def __init__(self):
+    def __init__(self, **options):
         super(PassWDQC, self).__init__(
             False,
             ": ",
             0,
-            "pwqcheck", "--multi", "-1"
+            "pwqcheck", "--multi", "-1",
+            **options
         )
 
 
 class ZxcvbnPython(Library):
 
-    def __init__(self):
-        super(ZxcvbnPython, self).__init__()
+    in_process = True
+    pool_chunks = True
 
-    def checkPassword(self, password, pcl_dic):
-        result = zxcvbn(password)
-        warning = result['feedback']['warning']
-        suggestions = result['feedback']['suggestions']
+    def __init__(self, max_length=None, time_budget=None, **options):
+        """zxcvbn runs in this process, with workers > 1 passwords
+        are checked in chunks of chunk_size by pool of processes
 
-        output = ''
-        if (warning):
-            output = warning + ' '
-        if (suggestions):
-            output += ' '.join(str(sugg) for sugg in suggestions)
+        Cost of zxcvbn grows fast with length of password, passwords
+        over budget are checked at the end by low priority processes
 
-        self.storePCLOutput(
-            pcl_dic,
-            password,
-            (output, result['score'])
-            )
+        Arguments:
+        max_length -- int, longer passwords are over budget
+        time_budget -- float, seconds, passwords are checked from the
+                       shortest, if one check takes longer, remaining
+                       longer passwords are over budget
+        """
+        super(ZxcvbnPython, self).__init__(**options)
+        self.max_length = max_length
+        self.time_budget = time_budget
+        self.over_budget = 0
+
+    def checkPasswordList(self, password_list, pcl_dic):
+        if (not self.max_length and not self.time_budget):
+            self.checkPasswordChunks(password_list, pcl_dic)
+            return
+
+        budget_list = []
+        tail_list = []
+        for password in password_list:
+            if (self.max_length and len(password) > self.max_length):
+                tail_list.append(password)
+            else:
+                budget_list.append(password)
+
+        if (self.workers <= 1):
+            result_list = [zxcvbnCheckBudget(
+                budget_list,
+                self.time_budget,
+                self.stats.slowest
+                )]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=zxcvbnInitWorker
+            ) as executor:
+                result_list = list(executor.map(
+                    zxcvbnCheckBudget,
+                    self.getChunkList(budget_list),
+                    repeat(self.time_budget),
+                    repeat(self.stats.slowest)
+                    ))
+
+        for output_list, deferred_list, chunk_stats in result_list:
+            self.stats.addChunk(chunk_stats)
+            with self.stats.measure('store'):
+                for password, output in output_list:
+                    self.storeOutput(pcl_dic, password, output)
+            tail_list += deferred_list
+
+        self.over_budget = len(tail_list)
+        if (tail_list):
+            print(
+                "ZxcvbnPython: " + str(len(tail_list)) +
+                " passwords over budget, checking them with low priority"
+                )
+            self.checkPasswordChunks(
+                tail_list,
+                pcl_dic,
+                initializer=zxcvbnInitLowPriorityWorker
+                )
+
+    def checkPasswordChunks(
+        self, password_list, pcl_dic, initializer=None
+            ):
+        """Check passwords in this process, or with pool of processes
+        if workers > 1 or initializer of worker is set
+
+        Times of chunk are added to stats at once, so stats
+        don't lock for every password
+        """
+        chunk_list = self.getChunkList(password_list)
+
+        if (self.workers <= 1 and not initializer):
+            result_iter = (
+                zxcvbnCheckChunk(chunk, self.stats.slowest)
+                for chunk in chunk_list
+                )
+            self.storeChunks(pcl_dic, chunk_list, result_iter)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=max(self.workers, 1),
+            initializer=initializer if (initializer) else zxcvbnInitWorker
+        ) as executor:
+            self.storeChunks(pcl_dic, chunk_list, executor.map(
+                zxcvbnCheckChunk,
+                chunk_list,
+                repeat(self.stats.slowest)
+                ))
+
+    def storeChunks(self, pcl_dic, chunk_list, result_iter):
+        for chunk, (output_list, chunk_stats) in zip(chunk_list, result_iter):
+            self.stats.addChunk(chunk_stats)
+            with self.stats.measure('store'):
+                for password, output in zip(chunk, output_list):
+                    self.storeOutput(pcl_dic, password, output)
+
+    def getChunkList(self, password_list):
+        return [
+            password_list[i:i + self.chunk_size]
+            for i in range(0, len(password_list), self.chunk_size)
+            ]
+
+    def getOutput(self, password):
+        with self.stats.measure('check'):
+            return zxcvbnOutput(password)
+
+
+def zxcvbnOutput(password):
+    """Return (feedback, score) tuple of zxcvbn for password
+    """
+    result = zxcvbn(password)
+    warning = result['feedback']['warning']
+    suggestions = result['feedback']['suggestions']
+
+    output = ''
+    if (warning):
+        output = warning + ' '
+    if (suggestions):
+        output += ' '.join(str(sugg) for sugg in suggestions)
+
+    return (output, result['score'])
+
+
+def zxcvbnInitWorker():
+    """Load ranked dictionaries of zxcvbn once in every worker process
+    """
+    zxcvbn('warm up')
+
+
+def zxcvbnInitLowPriorityWorker():
+    os.nice(10)
+    zxcvbnInitWorker()
+
+
+def zxcvbnCheckChunk(password_chunk, slowest=10):
+    """Return list of outputs and ChunkStats of chunk
+    """
+    chunk_stats = ChunkStats(slowest)
+    output_list = []
+
+    for password in password_chunk:
+        start = time.perf_counter()
+        output_list.append(zxcvbnOutput(password))
+        chunk_stats.addPasswordTime(password, time.perf_counter() - start)
+
+    return output_list, chunk_stats
+
+
+def zxcvbnCheckBudget(password_chunk, time_budget, slowest=10):
+    """Check passwords from the shortest, after first check longer
+    than time_budget remaining longer passwords are not checked
+
+    Return value:
+    output_list -- list of (password, output) tuples
+    deferred_list -- list of passwords over time budget
+    chunk_stats -- class ChunkStats of checked passwords
+    """
+    chunk_stats = ChunkStats(slowest)
+    output_list = []
+    deferred_list = []
+    length_limit = None
+
+    for password in sorted(password_chunk, key=len):
+        if (length_limit is not None and len(password) > length_limit):
+            deferred_list.append(password)
+            continue
+
+        start = time.perf_counter()
+        output_list.append((password, zxcvbnOutput(password)))
+        seconds = time.perf_counter() - start
+        chunk_stats.addPasswordTime(password, seconds)
+
+        if (time_budget and length_limit is None and seconds > time_budget):
+            length_limit = len(password)
+
+    return output_list, deferred_list, chunk_stats
 
 
 class ZxcvbnC(Library):
 
-    def __init__(self):
+    def __init__(
+        self, backend='subprocess', library_path=None, dictionary=None,
+        **options
+            ):
+        """
+        Arguments:
+        backend -- 'subprocess' pipes passwords through zxcvbn-c test-file,
+                   'ctypes' calls ZxcvbnMatch from zxcvbn-c shared library,
+                   with workers > 1 chunks are checked by threads
+        library_path -- path to zxcvbn-c shared library, None means
+                        system libzxcvbn or library next to test-file
+        dictionary -- path to zxcvbn-c dictionary file, only for library
+                      built with separate dictionary
+        """
         super(ZxcvbnC, self).__init__(
             False,
             " \tEntropy ",
             1,
-            "./../zxcvbn-c/test-file", "-q"
+            "./../zxcvbn-c/test-file", "-q",
+            **options
         )
+        self.backend = backend
+        self.library_path = library_path
+        self.dictionary = dictionary
+        self.checkBackend(backend, ('subprocess', 'ctypes'))
+
+        if (backend == 'ctypes'):
+            self.loadLibZxcvbn(library_path, dictionary)
+
+    def loadLibZxcvbn(self, library_path, dictionary):
+        if (not library_path):
+            library_path = ctypes.util.find_library('zxcvbn') or \
+                './../zxcvbn-c/libzxcvbn.so'
+
+        try:
+            # CDLL releases GIL for every call
+            self.libzxcvbn = ctypes.CDLL(library_path)
+        except OSError as err:
+            errorPrinter.printError(self.__class__.__name__, err)
+
+        self.libzxcvbn.ZxcvbnMatch.argtypes = [
+            ctypes.c_char_p,
+            ctypes.POINTER(ctypes.c_char_p),
+            ctypes.c_void_p
+            ]
+        self.libzxcvbn.ZxcvbnMatch.restype = ctypes.c_double
+        self.in_process = True
+
+        # Dictionary is loaded once for whole process
+        if (dictionary):
+            self.libzxcvbn.ZxcvbnInit.argtypes = [ctypes.c_char_p]
+            if (not self.libzxcvbn.ZxcvbnInit(bytes(dictionary, 'UTF-8'))):
+                errorPrinter.printError(
+                    self.__class__.__name__,
+                    'Dictionary \'' + dictionary + '\' was not loaded'
+                    )
+
+    def getFingerprintOptions(self):
+        return (self.library_path, self.dictionary)
+
+    def getOutput(self, password_input):
+        if (self.backend != 'ctypes'):
+            return super(ZxcvbnC, self).getOutput(password_input)
+
+        if (self.workers <= 1):
+            with self.stats.measure('check'):
+                output = self.matchPasswords(password_input)
+            with self.stats.measure('convert'):
+                return self.convertOutput(output)
+
+        chunk_list = [
+            password_input[i:i + self.chunk_size]
+            for i in range(0, len(password_input), self.chunk_size)
+            ]
+
+        output = []
+        with self.stats.measure('check'):
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for output_list in executor.map(
+                    self.matchPasswords,
+                    chunk_list
+                ):
+                    output += output_list
+
+        with self.stats.measure('convert'):
+            return self.convertOutput(output)
+
+    def matchPasswords(self, password_list):
+        """Return entropies in same format as resolved test-file output,
+        test-file prints entropy with 3 decimal places
+        """
+        return [
+            ('{0:.3f}'.format(self.libzxcvbn.ZxcvbnMatch(
+                bytes(password, 'UTF-8'), None, None
+                )), None)
+            for password in password_list
+            ]
 
     def convertOutput(self, input_output):
         output = []
@@ -239,13 +1142,62 @@ class ZxcvbnC(Library):
 
 class Pwscore(Library):
 
-    def __init__(self):
+    def __init__(self, backend='subprocess', user=None, **options):
+        """
+        Arguments:
+        backend -- 'subprocess' runs pwscore for every password,
+                   'pwquality' scores passwords in this process
+                   by python bindings of libpwquality
+        user -- string, user name passed to libpwquality
+                like 'pwscore user', used by 'pwquality' backend
+        """
         super(Pwscore, self).__init__(
             True,
             ":\n ",
             1,
-            "pwscore"
+            "pwscore",
+            **options
         )
+        self.backend = backend
+        self.user = user
+        self.checkBackend(backend, ('subprocess', 'pwquality'))
+
+        if (backend == 'pwquality'):
+            self.loadPwquality()
+
+    def loadPwquality(self):
+        try:
+            import pwquality
+        except ImportError:
+            errorPrinter.printError(
+                self.__class__.__name__,
+                'Python module pwquality was not found'
+                )
+
+        self.pwquality = pwquality
+        # One settings object for every thread of worker pool
+        self.pwquality_local = threading.local()
+        self.in_process = True
+
+    def getFingerprintOptions(self):
+        return (self.user, )
+
+    def getOutput(self, password):
+        if (self.backend != 'pwquality'):
+            return super(Pwscore, self).getOutput(password)
+
+        settings = getattr(self.pwquality_local, 'settings', None)
+        if (settings is None):
+            settings = self.pwquality.PWQSettings()
+            settings.read_config()
+            self.pwquality_local.settings = settings
+
+        # Same output as convertOutput of pwscore output
+        with self.stats.measure('check'):
+            try:
+                return ('', settings.check(password, None, self.user))
+            except self.pwquality.PWQError as err:
+                return (err.args[1], 0)
 
     def convertOutput(self, input_output):
         if (input_output[0].isdigit()):
@@ -259,13 +1211,56 @@ class Pwscore(Library):
 
 class Passfault(Library):
 
-    def __init__(self):
+    def __init__(self, backend='subprocess', **options):
+        """
+        Arguments:
+        backend -- 'subprocess' starts passfault for every check,
+                   'server' keeps pool of long-lived passfault processes,
+                   pool has up to 'workers' processes
+        """
         super(Passfault, self).__init__(
             False,
             "Rules found in password - ",
             1,
-            "./../passfault/commandLine/build/install/passfault/bin/passfault"
+            "./../passfault/commandLine/build/install/passfault/bin/passfault",
+            **options
         )
+        self.backend = backend
+        self.checkBackend(backend, ('subprocess', 'server'))
+
+        if (backend == 'server'):
+            self.server_pool = PassfaultPool(
+                self.args + ('-S', ),
+                max(self.workers, 1)
+                )
+
+    def getOutput(self, password_input):
+        if (self.backend != 'server'):
+            return super(Passfault, self).getOutput(password_input)
+
+        chunk_list = [
+            password_input[i:i + self.chunk_size]
+            for i in range(0, len(password_input), self.chunk_size)
+            ]
+
+        output = []
+        with self.stats.measure('check'), ThreadPoolExecutor(
+            max_workers=self.server_pool.size
+        ) as executor:
+            for output_list in executor.map(
+                lambda chunk: self.server_pool.check(chunk, self.delimiter),
+                chunk_list
+            ):
+                output += output_list
+
+        with self.stats.measure('convert'):
+            return self.convertOutput(output)
+
+    def close(self):
+        """Stop passfault processes of 'server' backend
+        """
+        if (self.backend == 'server'):
+            self.server_pool.close()
 
     def convertOutput(self, input_output):
         output = []
@@ -285,3 +1280,130 @@ class Passfault(Library):
             output.append((pcl_output, pcl_score))
 
         return output
+
+
+class PassfaultWorker():
+
+    def __init__(self, args):
+        """Long-lived passfault process started with -S option,
+        which answers every password from stdin with one line
+        """
+        self.process = subprocess.Popen(
+            args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            encoding='UTF-8'
+            )
+
+    def check(self, password_list, delimiter):
+        def writeInput():
+            try:
+                for password in password_list:
+                    self.process.stdin.write(password + '\n')
+                self.process.stdin.flush()
+            except (BrokenPipeError, ValueError):
+                pass
+
+        writer = threading.Thread(target=writeInput)
+        writer.start()
+
+        output_list = []
+        try:
+            for password in password_list:
+                line = self.process.stdout.readline()
+                if (not line):
+                    raise Exception('Passfault worker exited')
+
+                output_list.append(Library.resolveOutput(line, delimiter))
+        finally:
+            if (len(output_list) != len(password_list)):
+                self.close()
+            writer.join()
+
+        return output_list
+
+    def close(self):
+        if (self.process.poll() is None):
+            self.process.stdin.close()
+            self.process.kill()
+        self.process.wait()
+
+
+class PassfaultPool():
+
+    def __init__(self, args, size, max_retries=2):
+        """Pool of PassfaultWorker processes, workers are started
+        when they are needed and reused by next checks
+
+        Broken worker is closed and its place is given to next
+        check, which starts new worker
+
+        Arguments:
+        args -- arguments for run passfault in server mode
+        size -- int, maximum number of workers
+        max_retries -- int, number of repeated checks of one chunk
+                       with new worker after worker failed
+        """
+        self.args = args
+        self.size = size
+        self.max_retries = max_retries
+        self.idle = queue.Queue()
+        self.started = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            start = self.idle.empty() and self.started < self.size
+            if (start):
+                self.started += 1
+
+        # None in queue is place of broken worker
+        worker = None if (start) else self.idle.get()
+        if (worker is None):
+            try:
+                worker = PassfaultWorker(self.args)
+            except Exception:
+                self.idle.put(None)
+                raise
+
+        return worker
+
+    def release(self, worker, broken=False):
+        if (broken):
+            worker.close()
+            self.idle.put(None)
+        else:
+            self.idle.put(worker)
+
+    def check(self, password_list, delimiter):
+        """Return resolved output for every password in password_list,
+        chunk is checked again by new worker if worker fails
+        """
+        for attempt in range(self.max_retries + 1):
+            worker = self.acquire()
+            try:
+                output_list = worker.check(password_list, delimiter)
+            except Exception as err:
+                self.release(worker, broken=True)
+                errorPrinter.printWarning(
+                    self.__class__.__name__,
+                    'Passfault worker failed: ' + str(err)
+                    )
+                continue
+
+            self.release(worker)
+            return output_list
+
+        raise Exception(
+            'Passfault workers failed ' + str(self.max_retries + 1) +
+            ' times on one chunk'
+            )
+
+    def close(self):
+        with self.lock:
+            while (not self.idle.empty()):
+                worker = self.idle.get()
+                if (worker is not None):
+                    worker.close()
+                self.started -= 1
@@ -0,0 +1,188 @@
+import scripts.errorPrinter as errorPrinter
+import json
+import csv
+import os
+
+
+class LineReader():
+
+    def __init__(self, input_file):
+        """Iterate lines of text file by readline, so tell()
+        of file can be used between lines
+        """
+        self.input_file = input_file
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.input_file.readline()
+        if (not line):
+            raise StopIteration
+
+        return line
+
+
+class LineIndex():
+
+    def __init__(self, file_path, encoding='UTF-8', step=1000):
+        """Sidecar index with position of every step-th line of file,
+        range of lines is loaded without reading lines before it
+
+        Index is stored to file_path + '.idx' and built again
+        if size or modification time of file changes
+
+        Arguments:
+        file_path -- path to indexed text file
+        encoding -- encoding used to open file, positions are valid
+                    only for file opened with same encoding
+        step -- int, number of lines between two indexed lines
+        """
+        self.file_path = file_path
+        self.index_path = file_path + '.idx'
+        self.encoding = encoding
+        self.step = step
+        self.entry_list = None
+
+    def getRows(self, input_file):
+        """Return iterator of rows of input_file, rows are counted from 1
+        """
+        return LineReader(input_file)
+
+    def isEntry(self, row):
+        """True if reading of file can start at this row
+        """
+        return True
+
+    def getFileState(self):
+        stat = os.stat(self.file_path)
+
+        return {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'step': self.step,
+            'encoding': self.encoding,
+            'type': self.__class__.__name__
+        }
+
+    def load(self):
+        """Load index from sidecar file, build it if it is missing
+        or if it doesn't belong to current file
+        """
+        file_state = self.getFileState()
+
+        if (os.path.exists(self.index_path)):
+            try:
+                with open(self.index_path, 'r') as index_file:
+                    index_data = json.load(index_file)
+                if (index_data['state'] == file_state):
+                    self.entry_list = index_data['entries']
+                    return
+            except (ValueError, KeyError):
+                pass
+
+        self.build()
+
+        try:
+            with open(self.index_path, 'w') as index_file:
+                json.dump(
+                    {'state': file_state, 'entries': self.entry_list},
+                    index_file
+                    )
+        except IOError:
+            errorPrinter.printWarning(
+                self.__class__.__name__,
+                'Index \'' + self.index_path + '\' was not saved'
+                )
+
+    def build(self):
+        print("Building index of " + self.file_path)
+
+        self.entry_list = []
+
+        with open(self.file_path, 'r', encoding=self.encoding) as input_file:
+            rows = self.getRows(input_file)
+            number = 0
+            next_entry = 1
+
+            while (True):
+                position = input_file.tell() \
+                    if (number + 1 >= next_entry) else None
+                try:
+                    row = next(rows)
+                except StopIteration:
+                    break
+                number += 1
+
+                if (position is not None and self.isEntry(row)):
+                    self.entry_list.append([number, position])
+                    next_entry = number + self.step
+
+    def getEntry(self, number):
+        """Return (number of rows before, position) of indexed row
+        nearest before row number, position is None if there is none
+        """
+        if (self.entry_list is None):
+            self.load()
+
+        entry = None
+        low, high = 0, len(self.entry_list)
+        while (low < high):
+            middle = (low + high) // 2
+            if (self.entry_list[middle][0] <= number):
+                entry = self.entry_list[middle]
+                low = middle + 1
+            else:
+                high = middle
+
+        if (entry is None):
+            return 0, None
+
+        return entry[0] - 1, entry[1]
+
+    def seek(self, input_file, number):
+        """Move input_file to indexed row nearest before row number
+
+        Arguments:
+        input_file -- file opened with encoding of index
+        number -- int, row number counted from 1
+
+        Return value:
+        int, number of rows before new position of input_file
+        """
+        rows_before, position = self.getEntry(number)
+        if (position is not None):
+            input_file.seek(position)
+
+        return rows_before
+
+
+class CSVIndex(LineIndex):
+
+    def __init__(self, file_path, encoding=None, step=1000):
+        """Index of rows of csv file saved by SaveDataToCSV,
+        only rows of original passwords are indexed, so PassInfo
+        of original password exists for following transformed rows
+
+        Arguments:
+        file_path -- path to csv file
+        encoding -- encoding used to open file
+        step -- int, minimum number of rows between two indexed rows
+        """
+        super(CSVIndex, self).__init__(file_path, encoding, step)
+
+    def getRows(self, input_file):
+        csv_reader = csv.reader(
+            LineReader(input_file),
+            delimiter=',',
+            quotechar='\"',
+            quoting=csv.QUOTE_MINIMAL
+        )
+
+        # Header is not counted
+        next(csv_reader, None)
+
+        return csv_reader
+
+    def isEntry(self, row):
+        return len(row) > 1 and not row[1]
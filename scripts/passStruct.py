@@ -15,6 +15,23 @@ class PassInfo():
         if (orig_passinfo):
             self.orig_pass = orig_passinfo
 
+    @classmethod
+    def fromStoredData(
+        cls, password, diff_char, char_classes, orig_passinfo=None
+            ):
+        """Create PassInfo from attributes computed before,
+        e.g. stored by SaveDataToColumns, nothing is computed again
+        """
+        passinfo = cls.__new__(cls)
+        passinfo.password = password
+        passinfo.diff_char = diff_char
+        passinfo.char_classes = char_classes
+
+        if (orig_passinfo):
+            passinfo.orig_pass = orig_passinfo
+
+        return passinfo
+
     def __str__(self):
         return (
             '{0:15} ({1:.1f})'.format(
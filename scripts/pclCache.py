@@ -0,0 +1,112 @@
+import sqlite3
+import threading
+
+
+class PCLCache():
+
+    def __init__(self, file_path='outputs/pcl_cache.sqlite'):
+        """Persistent cache of password checking libraries outputs
+
+        Outputs are stored by name of library, fingerprint
+        of library configuration and password
+
+        Arguments:
+        file_path -- path to sqlite database
+        """
+        self.file_path = file_path
+        self.lock = threading.Lock()
+        self.hits = {}
+        self.misses = {}
+
+        self.connection = sqlite3.connect(file_path, check_same_thread=False)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS pcl_output (' +
+            'library TEXT, fingerprint TEXT, password TEXT, ' +
+            'output TEXT, score, ' +
+            'PRIMARY KEY (library, fingerprint, password)) WITHOUT ROWID'
+            )
+        self.connection.commit()
+
+    def get(self, pcl, password_list):
+        """Return cached outputs of library
+
+        Arguments:
+        pcl -- class Library
+        password_list -- list of unique passwords
+
+        Return value:
+        pcl_output_dic -- dictionary, key=password value=(output, score)
+        """
+        pcl_name = pcl.__class__.__name__
+        fingerprint = pcl.getFingerprint()
+        pcl_output_dic = {}
+
+        with self.lock:
+            # Stay under default limit of sqlite host parameters
+            for i in range(0, len(password_list), 500):
+                chunk = password_list[i:i + 500]
+                cursor = self.connection.execute(
+                    'SELECT password, output, score FROM pcl_output ' +
+                    'WHERE library = ? AND fingerprint = ? ' +
+                    'AND password IN (' + ', '.join('?' * len(chunk)) + ')',
+                    [pcl_name, fingerprint] + chunk
+                    )
+                for password, output, score in cursor:
+                    pcl_output_dic.update({password: (output, score)})
+
+            self.hits[pcl_name] = self.hits.get(pcl_name, 0) + \
+                len(pcl_output_dic)
+            self.misses[pcl_name] = self.misses.get(pcl_name, 0) + \
+                len(password_list) - len(pcl_output_dic)
+
+        return pcl_output_dic
+
+    def store(self, pcl, pcl_output_dic):
+        """Store outputs of library
+
+        Arguments:
+        pcl -- class Library
+        pcl_output_dic -- dictionary, key=password value=(output, score)
+        """
+        pcl_name = pcl.__class__.__name__
+        fingerprint = pcl.getFingerprint()
+
+        with self.lock:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO pcl_output VALUES (?, ?, ?, ?, ?)',
+                (
+                    (pcl_name, fingerprint, password, output[0], output[1])
+                    for password, output in pcl_output_dic.items()
+                )
+                )
+            self.connection.commit()
+
+    def resetStats(self):
+        """Start counting hits and misses of next check
+        """
+        with self.lock:
+            self.hits = {}
+            self.misses = {}
+
+    def getStats(self, pcl_name=None):
+        """Return (hits, misses) of one library or of all libraries
+        """
+        if (pcl_name):
+            return (self.hits.get(pcl_name, 0), self.misses.get(pcl_name, 0))
+
+        return (sum(self.hits.values()), sum(self.misses.values()))
+
+    def printStats(self, pcl_name=None):
+        hits, misses = self.getStats(pcl_name)
+        total = hits + misses
+
+        print(
+            'Cache' + (' ' + pcl_name if (pcl_name) else '') + ': ' +
+            str(hits) + ' hits, ' + str(misses) + ' misses' +
+            (' ({0:.1f}% hit rate)'.format(100.0 * hits / total)
+                if (total) else '')
+            )
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
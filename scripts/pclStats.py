@@ -0,0 +1,124 @@
+from contextlib import contextmanager
+
+import threading
+import heapq
+import time
+
+
+class PCLStats():
+
+    def __init__(self, slowest=10):
+        """Time spent by one password checking library
+
+        Phases:
+        spawn -- starting library process
+        io -- writing passwords and reading output of library
+        parse -- resolveOutput of library output
+        convert -- convertOutput of library
+        check -- library running in this process
+        store -- storePCLOutput
+
+        Phase times are summed over all threads,
+        so with workers > 1 they can be longer than wall time
+
+        Arguments:
+        slowest -- int, number of slowest passwords kept
+        """
+        self.lock = threading.Lock()
+        self.slowest = slowest
+        self.phases = {}
+        self.password_times = []
+
+    def __getstate__(self):
+        # Lock can't be sent to other process
+        state = self.__dict__.copy()
+        state.pop('lock')
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.addPhase(phase, time.perf_counter() - start)
+
+    def addPhase(self, phase, seconds):
+        with self.lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def addPasswordTime(self, password, seconds):
+        """Store time of one password, only for libraries
+        which check one password at a time
+        """
+        with self.lock:
+            pushSlowest(self.password_times, self.slowest, password, seconds)
+
+    def addChunk(self, chunk_stats):
+        """Add check time and slowest passwords of one chunk
+        """
+        with self.lock:
+            self.phases['check'] = self.phases.get('check', 0.0) + \
+                chunk_stats.check_time
+            for seconds, password in chunk_stats.password_times:
+                pushSlowest(
+                    self.password_times,
+                    self.slowest,
+                    password,
+                    seconds
+                    )
+
+    def getReport(self, password_count, wall_time):
+        """Return dictionary with throughput, phases and slowest passwords
+
+        Arguments:
+        password_count -- int, number of checked passwords
+        wall_time -- float, seconds of whole check with library
+        """
+        with self.lock:
+            return {
+                'passwords': password_count,
+                'wall_time': wall_time,
+                'passwords_per_second':
+                    password_count / wall_time if (wall_time) else None,
+                'phases': dict(self.phases),
+                'slowest_passwords': [
+                    {'password': password, 'time': seconds}
+                    for seconds, password in sorted(
+                        self.password_times,
+                        reverse=True
+                        )
+                    ]
+            }
+
+
+class ChunkStats():
+
+    def __init__(self, slowest=10):
+        """Check time and slowest passwords of one chunk, collected
+        without lock in thread or process which checks chunk
+        and added to PCLStats by PCLStats.addChunk
+
+        Arguments:
+        slowest -- int, number of slowest passwords kept
+        """
+        self.slowest = slowest
+        self.check_time = 0.0
+        self.password_times = []
+
+    def addPasswordTime(self, password, seconds):
+        self.check_time += seconds
+        pushSlowest(self.password_times, self.slowest, password, seconds)
+
+
+def pushSlowest(password_times, slowest, password, seconds):
+    """Keep slowest passwords in heap password_times
+    """
+    if (len(password_times) < slowest):
+        heapq.heappush(password_times, (seconds, password))
+    elif (seconds > password_times[0][0]):
+        heapq.heapreplace(password_times, (seconds, password))
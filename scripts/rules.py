@@ -14,27 +14,41 @@ class Transformation():
 
     def apply(self, password_list):
         print("Transformation...")
-        passinfo_list = []
+
+        passinfo_list = list(self.iterate(password_list))
+
+        print("Transformation DONE\n")
+
+        return passinfo_list
+
+    def iterate(self, password_iter):
+        """Yield PassInfo classes in the same order as apply,
+        password is transformed when it is read from password_iter
+
+        Arguments:
+        password_iter -- iterable of passwords, e.g. Loader.iterate
+        """
         used_transformations = []
 
-        for password in password_list:
+        for password in password_iter:
             if (type(password) is not PassData):
                 orig_passinfo = PassInfo(
                     password=password
                     )
-                passinfo_list.append(orig_passinfo)
-
-                if (self.transformation_list):
-                    trans_passinfo = PassInfo(
-                        password=password,
-                        orig_passinfo=orig_passinfo
-                        )
-                    passinfo_list.append(trans_passinfo)
+                yield orig_passinfo
+
+                if (not self.transformation_list):
+                    continue
+
+                trans_passinfo = PassInfo(
+                    password=password,
+                    orig_passinfo=orig_passinfo
+                    )
             else:
                 if (hasattr(password, 'transform_rules')):
                     trans_passinfo = password
                 else:
-                    passinfo_list.append(password)
+                    yield password
                     continue
 
             for trans in self.transformation_list:
@@ -44,9 +58,8 @@ class Transformation():
 
                 trans.transform(trans_passinfo)
 
-        print("Transformation DONE\n")
-
-        return passinfo_list
+            if (trans_passinfo is not password):
+                yield trans_passinfo
 
 
 class Rule():
@@ -0,0 +1,311 @@
+from collections import deque
+from multiprocessing.managers import BaseManager
+
+import scripts.errorPrinter as errorPrinter
+import multiprocessing
+import threading
+import secrets
+import socket
+import time
+import os
+
+
+class CoordinatorManager(BaseManager):
+    pass
+
+
+class WorkerManager(BaseManager):
+    pass
+
+
+WorkerManager.register('getBroker')
+
+
+class ShardBroker():
+
+    def __init__(self, shard_list, lease_timeout, max_retries):
+        """Shards of passwords waiting for workers and their results
+
+        Shard leased by worker is returned to queue if worker
+        doesn't send result before lease_timeout
+
+        Arguments:
+        shard_list -- list of password lists
+        lease_timeout -- float, seconds for one shard
+        max_retries -- int, maximum number of leases of one shard
+        """
+        self.shard_list = shard_list
+        self.lease_timeout = lease_timeout
+        self.max_retries = max_retries
+        self.lock = threading.Lock()
+
+        self.pending = deque(range(len(shard_list)))
+        self.leased = {}
+        self.retries = {}
+        self.results = {}
+        self.failed = None
+
+    def getShard(self, worker_id):
+        """Return (shard_id, password_list) for worker,
+        (None, None) if worker should wait, None if everything is done
+        """
+        with self.lock:
+            self.requeueExpired()
+
+            if (self.failed or len(self.results) == len(self.shard_list)):
+                return None
+            if (not self.pending):
+                return (None, None)
+
+            shard_id = self.pending.popleft()
+            self.retries[shard_id] = self.retries.get(shard_id, 0) + 1
+            if (self.retries[shard_id] > self.max_retries):
+                self.failed = 'Shard ' + str(shard_id) + ' failed ' + \
+                    str(self.max_retries) + ' times'
+                return None
+
+            self.leased.update({
+                shard_id: (worker_id, time.time() + self.lease_timeout)
+                })
+
+            return (shard_id, self.shard_list[shard_id])
+
+    def putResult(self, shard_id, pcl_dic):
+        with self.lock:
+            self.leased.pop(shard_id, None)
+            if (shard_id not in self.results):
+                self.results.update({shard_id: pcl_dic})
+            if (shard_id in self.pending):
+                self.pending.remove(shard_id)
+
+    def reportFailure(self, shard_id, worker_id, error_text):
+        """Worker failed to check shard, give shard to another worker
+        """
+        errorPrinter.printWarning(
+            'ShardBroker',
+            'Worker ' + str(worker_id) + ' failed on shard ' +
+            str(shard_id) + ': ' + str(error_text)
+            )
+
+        with self.lock:
+            if (shard_id in self.leased):
+                self.leased.pop(shard_id)
+                self.pending.appendleft(shard_id)
+
+    def requeueExpired(self):
+        now = time.time()
+        for shard_id, (worker_id, deadline) in list(self.leased.items()):
+            if (deadline < now):
+                errorPrinter.printWarning(
+                    'ShardBroker',
+                    'Worker ' + str(worker_id) + ' lost shard ' +
+                    str(shard_id) + ', shard is checked again'
+                    )
+                self.leased.pop(shard_id)
+                self.pending.appendleft(shard_id)
+
+    def getProgress(self):
+        with self.lock:
+            self.requeueExpired()
+            return (len(self.results), len(self.shard_list), self.failed)
+
+
+class ShardCoordinator():
+
+    def __init__(
+        self, address=('localhost', 50000), authkey=None,
+        shard_size=10000, lease_timeout=600, max_retries=3
+            ):
+        """Split unique passwords to shards and collect outputs
+        of ShardWorker processes, which can run on other machines
+
+        Coordinator and workers send objects by pickle, anybody who
+        knows authkey and can connect to address can run code
+        on coordinator and workers. Coordinator listens only
+        on localhost by default, workers on other machines need
+        address with public interface, e.g. ('', 50000), use it
+        only in trusted network.
+
+        Arguments:
+        address -- (host, port) tuple, where coordinator listens
+        authkey -- bytes, shared secret of coordinator and workers,
+                   random key is generated and printed if it is None
+        shard_size -- int, number of passwords in one shard
+        lease_timeout -- float, seconds after shard of lost worker
+                         is given to another worker
+        max_retries -- int, maximum number of attempts for one shard
+        """
+        self.address = address
+        self.authkey = authkey
+        if (self.authkey is None):
+            self.authkey = secrets.token_hex(16).encode()
+            print("Coordinator authkey: " + self.authkey.decode())
+        self.shard_size = shard_size
+        self.lease_timeout = lease_timeout
+        self.max_retries = max_retries
+
+    def check(self, passinfo_list):
+        """Check passwords by workers, same output as PassCheckLib.check
+
+        Arguments:
+        passinfo_list -- list, list of PassInfo classes
+
+        Return value:
+        pcl_dic -- dictionary, key=string value=dictionary
+        """
+        return self.checkPasswordList(
+            [passinfo.password for passinfo in passinfo_list]
+            )
+
+    def checkPasswordList(self, password_list):
+        print("Checking passwords... using " + self.__class__.__name__)
+
+        pcl_dic = {}
+        for password in password_list:
+            if (password not in pcl_dic):
+                pcl_dic.update({password: {}})
+
+        unique_list = list(pcl_dic.keys())
+        broker = ShardBroker(
+            [
+                unique_list[i:i + self.shard_size]
+                for i in range(0, len(unique_list), self.shard_size)
+            ],
+            self.lease_timeout,
+            self.max_retries
+            )
+
+        CoordinatorManager.register('getBroker', callable=lambda: broker)
+        server = CoordinatorManager(
+            address=self.address,
+            authkey=self.authkey
+            ).get_server()
+        server_thread = threading.Thread(
+            target=server.serve_forever,
+            daemon=True
+            )
+        server_thread.start()
+
+        try:
+            last_done = -1
+            while (True):
+                done, total, failed = broker.getProgress()
+                if (failed):
+                    errorPrinter.printError(self.__class__.__name__, failed)
+                if (done != last_done):
+                    print("Shards: " + str(done) + '/' + str(total))
+                    last_done = done
+                if (done == total):
+                    break
+
+                time.sleep(0.5)
+        finally:
+            # Let workers ask for next shard and finish
+            time.sleep(1)
+            server.stop_event.set()
+            server.listener.close()
+
+        for shard_id in range(len(broker.shard_list)):
+            for password, pcl_output in broker.results[shard_id].items():
+                pcl_dic[password].update(pcl_output)
+
+        print("Checking passwords DONE\n")
+
+        return pcl_dic
+
+
+class ShardWorker():
+
+    def __init__(
+        self, pass_check_lib, authkey, address=('localhost', 50000),
+        worker_id=None, poll_interval=1.0
+            ):
+        """Check shards from ShardCoordinator with PassCheckLib
+
+        Arguments:
+        pass_check_lib -- class PassCheckLib with added libraries
+        authkey -- bytes, authkey of coordinator
+        address -- (host, port) tuple of coordinator
+        worker_id -- string, name of worker in coordinator messages
+        poll_interval -- float, seconds between asks for shard
+        """
+        self.pass_check_lib = pass_check_lib
+        self.address = address
+        self.authkey = authkey
+        self.worker_id = worker_id if (worker_id) \
+            else socket.gethostname() + ':' + str(os.getpid())
+        self.poll_interval = poll_interval
+
+    def run(self):
+        """Check shards until coordinator has no work
+        """
+        manager = WorkerManager(address=self.address, authkey=self.authkey)
+
+        # Coordinator could start later than worker
+        for attempt in range(60):
+            try:
+                manager.connect()
+                break
+            except ConnectionError:
+                time.sleep(self.poll_interval)
+        else:
+            errorPrinter.printError(
+                self.__class__.__name__,
+                'Coordinator ' + str(self.address) + ' is not running'
+                )
+
+        broker = manager.getBroker()
+
+        try:
+            while (True):
+                shard = broker.getShard(self.worker_id)
+                if (shard is None):
+                    break
+
+                shard_id, password_list = shard
+                if (shard_id is None):
+                    time.sleep(self.poll_interval)
+                    continue
+
+                try:
+                    pcl_dic = self.pass_check_lib.checkPasswordList(
+                        password_list
+                        )
+                except Exception as err:
+                    broker.reportFailure(shard_id, self.worker_id, err)
+                    continue
+
+                broker.putResult(shard_id, pcl_dic)
+        except (EOFError, ConnectionError):
+            # Coordinator finished
+            pass
+
+
+def startLocalWorkers(
+    pass_check_lib, count, authkey, address=('localhost', 50000)
+        ):
+    """Start count ShardWorker processes on this machine
+
+    Arguments:
+    pass_check_lib -- class PassCheckLib with added libraries
+    count -- int, number of worker processes
+    authkey -- bytes, authkey of coordinator
+    address -- (host, port) tuple of coordinator
+
+    Return value:
+    list of multiprocessing.Process
+    """
+    process_list = []
+    for i in range(count):
+        process = multiprocessing.Process(
+            target=ShardWorker(
+                pass_check_lib,
+                authkey,
+                address,
+                'local-' + str(i)
+                ).run
+            )
+        process.start()
+        process_list.append(process)
+
+    return process_list
@@ -0,0 +1,40 @@
+import scripts.libCheck as libCheck
+import unittest
+
+
+class FingerprintTest(unittest.TestCase):
+
+    def testCrackLibDictionary(self):
+        default = libCheck.CrackLib()
+        other = libCheck.CrackLib(dictionary='/tmp/other_dict')
+
+        self.assertNotEqual(default.getFingerprint(), other.getFingerprint())
+        self.assertEqual(
+            other.getFingerprint(),
+            libCheck.CrackLib(dictionary='/tmp/other_dict').getFingerprint()
+            )
+
+    def testPwscoreUser(self):
+        self.assertNotEqual(
+            libCheck.Pwscore(user='alice').getFingerprint(),
+            libCheck.Pwscore(user='bob').getFingerprint()
+            )
+
+    def testZxcvbnCLibraryAndDictionary(self):
+        fingerprint_list = [
+            libCheck.ZxcvbnC().getFingerprint(),
+            libCheck.ZxcvbnC(library_path='/tmp/a.so').getFingerprint(),
+            libCheck.ZxcvbnC(dictionary='/tmp/zxcvbn.dict').getFingerprint()
+            ]
+
+        self.assertEqual(len(set(fingerprint_list)), 3)
+
+    def testOptionsWithoutOutputChange(self):
+        self.assertEqual(
+            libCheck.CrackLib().getFingerprint(),
+            libCheck.CrackLib(workers=4, stream=True).getFingerprint()
+            )
+
+
+if (__name__ == '__main__'):
+    unittest.main()
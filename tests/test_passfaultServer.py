@@ -0,0 +1,46 @@
+import scripts.libCheck as libCheck
+import subprocess
+import unittest
+import os
+
+
+# passfault built with scripts/TextAnalysis.java, path can be
+# changed by environment variable PASSFAULT
+PASSFAULT = os.environ.get('PASSFAULT', libCheck.Passfault().args[0])
+
+
+@unittest.skipUnless(
+    os.path.exists(PASSFAULT),
+    'passfault built with scripts/TextAnalysis.java was not found'
+    )
+class PassfaultServerTest(unittest.TestCase):
+
+    def runPassfault(self, args, password_list):
+        return subprocess.run(
+            [PASSFAULT] + args,
+            input=''.join(password + '\n' for password in password_list),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            encoding='UTF-8',
+            timeout=300
+            ).stdout
+
+    def testOneLinePerPassword(self):
+        password_list = ['password', '', 'Tr0ub4dor&3', 'x']
+        line_list = self.runPassfault(['-S'], password_list).splitlines()
+
+        self.assertEqual(len(line_list), len(password_list))
+        for line in line_list:
+            self.assertTrue(line.startswith('Rules found in password - '))
+            self.assertIn('Total complexity', line)
+
+    def testTimeToCrackRejected(self):
+        for args in (['-s', '1000'], ['-g', '1', '-f', '0']):
+            output = self.runPassfault(['-S'] + args, ['password'])
+
+            self.assertIn('CLI error', output)
+            self.assertNotIn('Rules found in password', output)
+
+
+if (__name__ == '__main__'):
+    unittest.main()